@@ -2,16 +2,409 @@
 Alert delivery mechanisms (email and webhook).
 """
 import logging
+import random
 import smtplib
+import threading
+import time
 import requests
-import json
-from email.mime.text import MIMEText
+from requests.adapters import HTTPAdapter
+import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from email import policy
+from email.header import Header
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any, List
+from email.mime.nonmultipart import MIMENonMultipart
+from typing import Dict, Any, List, Optional, Tuple
+from enum import Enum
+from urllib.parse import urlsplit
+from jinja2 import Environment
+import dns_cache
 from health_scorer import Alert, AlertLevel
+from chaos import chaos_enabled, install_chaos
 
 logger = logging.getLogger(__name__)
 
+# Email bodies are compiled once at import; only alert fields are rendered per message.
+# The HTML template autoescapes so alert text can't inject markup.
+_TEXT_TEMPLATE = Environment(keep_trailing_newline=True, trim_blocks=True).from_string("""
+Tomcat Monitoring Alert{% if alerts|length > 1 %}s ({{ alerts|length }}){% endif %}
+
+
+{% for alert in alerts %}
+Level: {{ alert.level.value|upper }}
+Title: {{ alert.title }}
+Message: {{ alert.message }}
+Metric: {{ alert.metric }}
+Current Value: {{ alert.value }}
+Threshold: {{ alert.threshold }}
+Time: {{ alert.timestamp }}
+
+{% endfor %}
+---
+Tomcat Monitoring Toolkit
+""")
+
+_HTML_TEMPLATE = Environment(autoescape=True, keep_trailing_newline=True, trim_blocks=True).from_string("""
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; }
+        .alert { padding: 20px; border-radius: 5px; margin: 10px 0; }
+        .critical { background-color: #ffebee; border-left: 5px solid #f44336; }
+        .warning { background-color: #fff3e0; border-left: 5px solid #ff9800; }
+        .info { background-color: #e3f2fd; border-left: 5px solid #2196f3; }
+        .metric { margin: 10px 0; padding: 10px; background-color: #f5f5f5; }
+    </style>
+</head>
+<body>
+    <h2>Tomcat Monitoring Alert{% if alerts|length > 1 %}s ({{ alerts|length }}){% endif %}</h2>
+{% for alert in alerts %}
+    <div class="alert {{ alert.level.value }}">
+        <h3>{{ alert.title }}</h3>
+        <p><strong>Level:</strong> {{ alert.level.value|upper }}</p>
+        <p><strong>Message:</strong> {{ alert.message }}</p>
+        <div class="metric">
+            <p><strong>Metric:</strong> {{ alert.metric }}</p>
+            <p><strong>Current Value:</strong> {{ alert.value }}</p>
+            <p><strong>Threshold:</strong> {{ alert.threshold }}</p>
+        </div>
+    </div>
+{% endfor %}
+    <hr>
+    <p><em>Tomcat Monitoring Toolkit</em></p>
+</body>
+</html>
+""")
+
+# Placeholders in the pre-serialized email skeleton, cut out once so content is spliced in between
+_SUBJECT_MARK = b'@@SUBJECT@@'
+_TEXT_MARK = b'@@TEXT@@'
+_HTML_MARK = b'@@HTML@@'
+
+
+def _build_skeleton(from_addr: str, to_addrs: List[str]) -> Tuple[bytes, ...]:
+    """
+    Serialize a multipart/alternative message once, with placeholders for the dynamic parts.
+    
+    Headers, boundary and part headers are fixed per alerter, so the MIME
+    machinery only has to run here rather than for every alert.
+    
+    Args:
+        from_addr: Sender address
+        to_addrs: Recipient addresses
+    
+    Returns:
+        Wire-format message bytes (CRLF line endings) split at the subject,
+        text and HTML placeholders: four segments to join around the content
+    """
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = _SUBJECT_MARK.decode()
+    msg['From'] = from_addr
+    msg['To'] = ', '.join(to_addrs)
+    
+    for subtype, mark in (('plain', _TEXT_MARK), ('html', _HTML_MARK)):
+        part = MIMENonMultipart('text', subtype, charset='utf-8')
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.set_payload(mark.decode())
+        msg.attach(part)
+    
+    raw = msg.as_bytes(policy=policy.SMTP)
+    
+    # Split up front rather than replacing markers per message, so marker-like
+    # text in a subject or alert can never be mistaken for a placeholder
+    segments = []
+    for mark in (_SUBJECT_MARK, _TEXT_MARK, _HTML_MARK):
+        before, found, raw = raw.partition(mark)
+        if not found:
+            raise ValueError(f"Email skeleton is missing placeholder {mark!r}")
+        segments.append(before)
+    segments.append(raw)
+    return tuple(segments)
+
+
+def _encode_subject(subject: str) -> bytes:
+    """Make a subject safe to splice into the header block (no CR/LF, RFC 2047 if non-ASCII)."""
+    subject = ' '.join(subject.splitlines())
+    if subject.isascii():
+        return subject.encode('ascii')
+    # Long encoded subjects are folded; the rest of the message uses CRLF, so must the folds
+    return Header(subject, 'utf-8', header_name='Subject').encode(linesep='\r\n').encode('ascii')
+
+
+def _encode_body(text: str) -> bytes:
+    """Base64-encode a body part with CRLF line breaks."""
+    return base64.encodebytes(text.encode('utf-8')).replace(b'\n', b'\r\n').rstrip(b'\r\n')
+
+
+# Severity ranking used to pick a digest's subject level
+_LEVEL_RANK = {AlertLevel.INFO: 0, AlertLevel.WARNING: 1, AlertLevel.CRITICAL: 2}
+
+# Give up on a batch once at least a third of a large batch has failed
+ABORT_MIN_BATCH_SIZE = 30
+ABORT_FAILURE_RATIO = 1 / 3
+
+
+def _should_abort_batch(batch_size: int, failed: int) -> bool:
+    """Check whether a batch has failed badly enough to stop sending the rest."""
+    return batch_size >= ABORT_MIN_BATCH_SIZE and failed >= batch_size * ABORT_FAILURE_RATIO
+
+
+# HTTP statuses worth retrying; other 4xx responses (auth, bad request) are terminal
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_retryable_http(error: Exception) -> bool:
+    """Check whether a webhook failure is transient."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def _is_retryable_smtp(error: Exception) -> bool:
+    """Check whether an SMTP failure is transient."""
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 4xx replies are temporary failures; 5xx (including auth) are permanent
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPException):
+        # Other SMTP errors (refused recipients, unsupported commands) won't
+        # change on retry; SMTPException subclasses OSError, so check it first
+        return False
+    # Plain socket errors and timeouts
+    return isinstance(error, OSError)
+
+
+class Deadline:
+    """End-to-end time budget shared by every call made on behalf of one dispatch."""
+    
+    def __init__(self, seconds: float):
+        """
+        Initialize deadline.
+        
+        Args:
+            seconds: Time budget from now
+        """
+        self.expires = time.monotonic() + seconds
+    
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires - time.monotonic())
+    
+    def expired(self) -> bool:
+        """Check whether the budget is used up."""
+        return self.remaining() == 0
+
+
+def _bounded_timeout(timeout: float, deadline: Optional[Deadline]) -> float:
+    """Shrink a per-call timeout so it doesn't outlive the deadline."""
+    if deadline is None:
+        return timeout
+    return min(timeout, deadline.remaining())
+
+
+class LatencyTracker:
+    """Recent per-call latencies for one channel, reported with the monitoring status."""
+    
+    def __init__(self, name: str, maxlen: int = 500):
+        """
+        Initialize latency tracker.
+        
+        Args:
+            name: Channel name used in log messages
+            maxlen: Number of most recent samples to keep
+        """
+        self.name = name
+        self._samples = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float):
+        """Record the duration of one call."""
+        with self._lock:
+            self._samples.append(seconds)
+        logger.debug("%s call took %.1fms", self.name, seconds * 1000)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Get a latency percentile over the recent samples.
+        
+        Args:
+            pct: Percentile (0-100)
+        
+        Returns:
+            Latency in seconds, or None if nothing was recorded yet
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        return _percentile(samples, pct)
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the p50/p95 latencies over the recent samples.
+        
+        Returns:
+            Dictionary with sample count and p50/p95 in milliseconds (None if no samples)
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        p50 = _percentile(samples, 50)
+        p95 = _percentile(samples, 95)
+        return {
+            'samples': len(samples),
+            'p50_ms': p50 * 1000 if p50 is not None else None,
+            'p95_ms': p95 * 1000 if p95 is not None else None
+        }
+
+
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of already sorted samples (None if empty)."""
+    if not samples:
+        return None
+    index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+    return samples[index]
+
+
+def _retry(func, is_retryable, max_attempts: int = 4, base: float = 0.5, cap: float = 30.0,
+           deadline: Optional[Deadline] = None):
+    """
+    Call func, retrying transient failures with capped exponential backoff.
+    
+    Uses "full jitter": each sleep is uniform in [0, min(cap, base * 2**attempt)],
+    which spreads retries out so a recovering endpoint isn't hit in lockstep.
+    
+    Args:
+        func: Zero-argument callable to invoke
+        is_retryable: Predicate deciding whether an exception is transient
+        max_attempts: Total number of attempts
+        base: Base delay in seconds
+        cap: Maximum delay in seconds
+        deadline: Optional deadline; no retry is attempted past it
+    
+    Returns:
+        Result of func
+    """
+    for attempt in range(max_attempts):
+        try:
+            return func()
+        except Exception as e:
+            if attempt + 1 >= max_attempts or not is_retryable(e):
+                raise
+            delay = random.uniform(0, min(cap, base * 2 ** attempt))
+            if deadline is not None and delay >= deadline.remaining():
+                raise
+            logger.warning(f"Transient failure ({e}), retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for an outbound alert channel.
+    
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected immediately for ``recovery_timeout`` seconds. It then
+    goes half-open and lets ``half_open_max_calls`` probe calls through; a
+    successful probe closes the circuit, a failed one re-opens it.
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            name: Channel name used in log messages
+            failure_threshold: Consecutive failures before opening
+            recovery_timeout: Seconds to stay open before probing
+            half_open_max_calls: Probe calls allowed while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        
+        self.state = CircuitState.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Check whether a call may proceed."""
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    return False
+                self.state = CircuitState.HALF_OPEN
+                self._half_open_calls = 0
+                logger.info(f"{self.name} circuit half-open, probing")
+            
+            if self.state == CircuitState.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    return False
+                self._half_open_calls += 1
+            
+            return True
+    
+    def record_success(self):
+        """Record a successful call."""
+        with self._lock:
+            if self.state != CircuitState.CLOSED:
+                logger.info(f"{self.name} circuit closed")
+            self.state = CircuitState.CLOSED
+            self.failure_count = 0
+    
+    def record_failure(self):
+        """Record a failed call."""
+        with self._lock:
+            self.failure_count += 1
+            if self.state == CircuitState.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                if self.state != CircuitState.OPEN:
+                    logger.warning(f"{self.name} circuit opened after {self.failure_count} failures")
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+
+
+class Bulkhead:
+    """
+    Bounds the outstanding work on one alert channel.
+    
+    At most ``max_concurrent`` calls run at once (enforced by the channel's
+    workers) and at most ``max_queue`` more may wait; beyond that new work is
+    rejected immediately instead of piling up during an alert storm.
+    """
+    
+    def __init__(self, name: str, max_concurrent: int, max_queue: int):
+        """
+        Initialize bulkhead.
+        
+        Args:
+            name: Channel name used in log messages
+            max_concurrent: Calls allowed to run at once
+            max_queue: Calls allowed to wait for a free slot
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max_concurrent + max_queue)
+    
+    def try_acquire(self) -> bool:
+        """Reserve a slot without blocking; False if the channel is full."""
+        return self._slots.acquire(blocking=False)
+    
+    def release(self):
+        """Return a slot reserved with try_acquire."""
+        self._slots.release()
+
 
 class EmailAlerter:
     """Send alerts via email."""
@@ -31,22 +424,199 @@ class EmailAlerter:
         self.from_addr = config.get('from_addr', 'noreply@example.com')
         self.to_addrs = config.get('to_addrs', [])
         self.use_tls = config.get('use_tls', True)
+        # Separate budgets for establishing the session and for each SMTP command
+        self.connect_timeout = config.get('connect_timeout', config.get('timeout', 10))
+        self.command_timeout = config.get('command_timeout', 5)
+        self.latency = LatencyTracker('SMTP')
+        self.digest = config.get('digest', False)
+        self.retry_attempts = config.get('retry_attempts', 4)
+        self.retry_base_delay = config.get('retry_base_delay', 0.5)
+        self.retry_max_delay = config.get('retry_max_delay', 30.0)
+        
+        # Independent breaker per channel so one outage doesn't affect the other
+        self.breaker = CircuitBreaker(
+            'Email',
+            failure_threshold=config.get('circuit_failure_threshold', 5),
+            recovery_timeout=config.get('circuit_recovery_timeout', 30)
+        )
+        
+        # Sends are serialized on one session; bound how many batches may wait for it
+        self.bulkhead = Bulkhead('Email', max_concurrent=1, max_queue=config.get('max_queue', 10))
+        
+        # Headers and MIME structure don't change between alerts, so serialize them once
+        self._skeleton = _build_skeleton(self.from_addr, self.to_addrs)
+        
+        # Long-lived SMTP session shared across sends
+        self.smtp_factory = smtplib.SMTP
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
         
         if self.enabled:
             logger.info(f"Email alerter initialized (SMTP: {self.smtp_host}:{self.smtp_port})")
         else:
             logger.info("Email alerter disabled")
     
-    def send_alert(self, alert: Alert) -> bool:
+    def _render(self, subject: str, alerts: List[Alert]) -> Tuple[str, bytes]:
+        """Render alerts into the pre-serialized multipart skeleton."""
+        head, before_text, before_html, tail = self._skeleton
+        raw = b''.join((
+            head, _encode_subject(subject),
+            before_text, _encode_body(_TEXT_TEMPLATE.render(alerts=alerts)),
+            before_html, _encode_body(_HTML_TEMPLATE.render(alerts=alerts)),
+            tail
+        ))
+        return subject, raw
+    
+    def _build_message(self, alert: Alert) -> Tuple[str, bytes]:
+        """
+        Build the email message for an alert.
+        
+        Args:
+            alert: Alert object
+        
+        Returns:
+            (subject, wire-format message bytes)
+        """
+        return self._render(f"[{alert.level.value.upper()}] {alert.title}", [alert])
+    
+    def _build_digest(self, alerts: List[Alert]) -> Tuple[str, bytes]:
+        """
+        Build a single digest message covering several alerts.
+        
+        Args:
+            alerts: Alerts to include
+        
+        Returns:
+            (subject, wire-format message bytes) listing every alert
+        """
+        level = max((a.level for a in alerts), key=_LEVEL_RANK.__getitem__)
+        return self._render(f"[{level.value.upper()}] {len(alerts)} Tomcat alerts", alerts)
+    
+    def _connect(self, deadline: Optional[Deadline] = None) -> smtplib.SMTP:
+        """
+        Open a new SMTP session (STARTTLS and login as configured).
+        
+        Args:
+            deadline: Optional deadline bounding the connect and command timeouts
+        
+        Returns:
+            Connected SMTP client
+        """
+        timeout = _bounded_timeout(self.connect_timeout, deadline)
+        if timeout <= 0:
+            raise TimeoutError("Alert deadline exceeded before connecting")
+        
+        try:
+            server = self.smtp_factory(self.smtp_host, self.smtp_port, timeout=timeout)
+        except OSError:
+            # The cached address may be stale; resolve again on the next attempt
+            dns_cache.invalidate(self.smtp_host)
+            raise
+        try:
+            self._set_command_timeout(server, deadline)
+            if self.use_tls:
+                server.starttls()
+            
+            if self.smtp_user and self.smtp_password:
+                server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        
+        return server
+    
+    def _set_command_timeout(self, server: smtplib.SMTP, deadline: Optional[Deadline]):
+        """Apply the per-command timeout (bounded by the deadline) to the session socket."""
+        timeout = _bounded_timeout(self.command_timeout, deadline)
+        if timeout <= 0:
+            raise TimeoutError("Alert deadline exceeded")
+        if server.sock is not None:
+            server.sock.settimeout(timeout)
+    
+    def _get_connection(self, deadline: Optional[Deadline] = None) -> smtplib.SMTP:
+        """
+        Get the cached SMTP session, reconnecting if it has gone stale.
+        
+        Must be called with ``_smtp_lock`` held.
+        
+        Args:
+            deadline: Optional deadline bounding the connect timeout
+        """
+        if self._smtp is not None:
+            try:
+                # RSET is a cheap round-trip that also clears any half-sent transaction
+                self._set_command_timeout(self._smtp, deadline)
+                if self._smtp.rset()[0] == 250:
+                    return self._smtp
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self._drop_connection()
+        
+        self._smtp = self._connect(deadline)
+        return self._smtp
+    
+    def _drop_connection(self):
+        """Close the cached SMTP session. Must be called with ``_smtp_lock`` held."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+    
+    def _send_via(self, server: smtplib.SMTP, msg: bytes,
+                  deadline: Optional[Deadline] = None) -> smtplib.SMTP:
+        """
+        Send a message over an open session, reconnecting once if the server hung up.
+        
+        Args:
+            server: Open SMTP session
+            msg: Wire-format message to send
+            deadline: Optional deadline bounding the socket timeout
+        
+        Returns:
+            The session the message was sent on (a new one after a reconnect)
+        """
+        try:
+            self._set_command_timeout(server, deadline)
+            self._timed_send(server, msg)
+        except smtplib.SMTPServerDisconnected:
+            logger.info("SMTP server disconnected, reconnecting")
+            self._drop_connection()
+            server = self._get_connection(deadline)
+            self._timed_send(server, msg)
+        
+        return server
+    
+    def _timed_send(self, server: smtplib.SMTP, msg: bytes):
+        """Send a message and record how long the exchange took."""
+        start = time.monotonic()
+        server.sendmail(self.from_addr, self.to_addrs, msg)
+        self.latency.record(time.monotonic() - start)
+    
+    def close(self):
+        """Close the cached SMTP session."""
+        with self._smtp_lock:
+            self._drop_connection()
+    
+    def send_alert(self, alert: Alert, deadline: Optional[Deadline] = None) -> bool:
         """
         Send an alert via email.
         
         Args:
             alert: Alert object
+            deadline: Optional deadline for the whole send
         
         Returns:
             True if sent successfully, False otherwise
         """
+        return self.send_alerts([alert], deadline=deadline) == 1
+    
+    def _can_send(self) -> bool:
+        """Check that the alerter is enabled and configured."""
         if not self.enabled:
             logger.debug("Email alerter is disabled")
             return False
@@ -55,96 +625,135 @@ class EmailAlerter:
             logger.warning("No recipient email addresses configured")
             return False
         
-        try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"[{alert.level.value.upper()}] {alert.title}"
-            msg['From'] = self.from_addr
-            msg['To'] = ', '.join(self.to_addrs)
-            
-            # Create HTML and plain text versions
-            text_body = f"""
-Tomcat Monitoring Alert
-
-Level: {alert.level.value.upper()}
-Title: {alert.title}
-Message: {alert.message}
-Metric: {alert.metric}
-Current Value: {alert.value}
-Threshold: {alert.threshold}
-Time: {alert.timestamp}
-
----
-Tomcat Monitoring Toolkit
-"""
-            
-            html_body = f"""
-<html>
-<head>
-    <style>
-        body {{ font-family: Arial, sans-serif; }}
-        .alert {{ padding: 20px; border-radius: 5px; margin: 10px 0; }}
-        .critical {{ background-color: #ffebee; border-left: 5px solid #f44336; }}
-        .warning {{ background-color: #fff3e0; border-left: 5px solid #ff9800; }}
-        .info {{ background-color: #e3f2fd; border-left: 5px solid #2196f3; }}
-        .metric {{ margin: 10px 0; padding: 10px; background-color: #f5f5f5; }}
-    </style>
-</head>
-<body>
-    <h2>Tomcat Monitoring Alert</h2>
-    <div class="alert {alert.level.value}">
-        <h3>{alert.title}</h3>
-        <p><strong>Level:</strong> {alert.level.value.upper()}</p>
-        <p><strong>Message:</strong> {alert.message}</p>
-        <div class="metric">
-            <p><strong>Metric:</strong> {alert.metric}</p>
-            <p><strong>Current Value:</strong> {alert.value}</p>
-            <p><strong>Threshold:</strong> {alert.threshold}</p>
-        </div>
-    </div>
-    <hr>
-    <p><em>Tomcat Monitoring Toolkit</em></p>
-</body>
-</html>
-"""
-            
-            # Attach parts
-            part1 = MIMEText(text_body, 'plain')
-            part2 = MIMEText(html_body, 'html')
-            msg.attach(part1)
-            msg.attach(part2)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10) as server:
-                if self.use_tls:
-                    server.starttls()
-                
-                if self.smtp_user and self.smtp_password:
-                    server.login(self.smtp_user, self.smtp_password)
-                
-                server.send_message(msg)
-            
-            logger.info(f"Alert email sent: {alert.title}")
-            return True
+        return True
+    
+    def send_alerts(self, alerts: List[Alert], deadline: Optional[Deadline] = None) -> int:
+        """
+        Send multiple alerts over a single SMTP session.
         
-        except Exception as e:
-            logger.error(f"Failed to send email alert: {e}")
-            return False
+        With ``digest`` enabled, a batch of several alerts is sent as one
+        message instead (see send_alerts_batched).
+        
+        Args:
+            alerts: List of alerts
+            deadline: Optional deadline for the whole batch
+        
+        Returns:
+            Number of alerts sent successfully
+        """
+        if not alerts or not self._can_send():
+            return 0
+        
+        if self.digest and len(alerts) > 1:
+            return self.send_alerts_batched(alerts, deadline=deadline)
+        
+        return self._deliver([(*self._build_message(alert), 1) for alert in alerts], deadline)
     
-    def send_alerts(self, alerts: List[Alert]) -> int:
+    def send_alerts_batched(self, alerts: List[Alert], deadline: Optional[Deadline] = None) -> int:
         """
-        Send multiple alerts.
+        Send a batch of alerts as a single digest email.
+        
+        One message means one MAIL/RCPT/DATA exchange for the whole batch
+        rather than one per alert.
         
         Args:
             alerts: List of alerts
+            deadline: Optional deadline for the send
+        
+        Returns:
+            Number of alerts covered by the digest if it was sent, otherwise 0
+        """
+        if not alerts or not self._can_send():
+            return 0
+        
+        return self._deliver([(*self._build_digest(alerts), len(alerts))], deadline)
+    
+    def _deliver(self, messages: List[Tuple[str, bytes, int]],
+                 deadline: Optional[Deadline] = None) -> int:
+        """
+        Send prepared messages over the shared SMTP session.
+        
+        Args:
+            messages: (subject, message bytes, number of alerts it covers) tuples
+            deadline: Optional deadline; messages not sent by then are skipped
         
         Returns:
             Number of alerts sent successfully
         """
+        retry = dict(
+            is_retryable=_is_retryable_smtp,
+            max_attempts=self.retry_attempts,
+            base=self.retry_base_delay,
+            cap=self.retry_max_delay,
+            deadline=deadline
+        )
+        
+        if deadline is not None and deadline.expired():
+            logger.warning(f"Alert deadline exceeded, skipping {len(messages)} email messages")
+            return 0
+        
+        # Take the bulkhead slot first: allow() may hand out the only half-open
+        # probe, which must not be spent on a batch that is then rejected
+        if not self.bulkhead.try_acquire():
+            logger.warning(f"Email bulkhead full, skipping {len(messages)} messages")
+            return 0
+        
+        try:
+            if not self.breaker.allow():
+                logger.warning(f"Email circuit open, skipping {len(messages)} messages")
+                return 0
+            return self._deliver_locked(messages, deadline, retry)
+        finally:
+            self.bulkhead.release()
+    
+    def _deliver_locked(self, messages: List[Tuple[str, bytes, int]],
+                        deadline: Optional[Deadline], retry: Dict[str, Any]) -> int:
+        """Send messages while holding the SMTP session (see _deliver)."""
         sent_count = 0
-        for alert in alerts:
-            if self.send_alert(alert):
-                sent_count += 1
+        fail_count = 0
+        with self._smtp_lock:
+            try:
+                _retry(lambda: self._get_connection(deadline), **retry)
+                self.breaker.record_success()
+            except Exception as e:
+                logger.error(f"Failed to connect to SMTP server: {e}")
+                self.breaker.record_failure()
+                return 0
+            
+            for subject, msg, covered in messages:
+                if deadline is not None and deadline.expired():
+                    logger.warning("Alert deadline exceeded, skipping remaining emails")
+                    break
+                
+                if not self.breaker.allow():
+                    logger.warning("Email circuit open, skipping remaining alerts")
+                    break
+                
+                try:
+                    _retry(
+                        lambda: self._send_via(self._smtp or self._get_connection(deadline), msg, deadline),
+                        **retry
+                    )
+                    self.breaker.record_success()
+                    sent_count += covered
+                    logger.info(f"Alert email sent: {subject}")
+                except Exception as e:
+                    logger.error(f"Failed to send email alert: {e}")
+                    fail_count += 1
+                    if _is_retryable_smtp(e):
+                        # Connection lost, timeout or 4xx: the channel itself is in trouble
+                        self.breaker.record_failure()
+                    else:
+                        # The server answered (e.g. refused a recipient); the failure is
+                        # specific to this message and must not open the circuit
+                        self.breaker.record_success()
+                    if self._smtp is None:
+                        # Reconnect failed; nothing left to send on
+                        break
+                    if _should_abort_batch(len(messages), fail_count):
+                        logger.warning(f"Aborting email batch after {fail_count} failures")
+                        break
+        
         return sent_count
 
 
@@ -162,88 +771,234 @@ class WebhookAlerter:
         self.url = config.get('url', '')
         self.method = config.get('method', 'POST').upper()
         self.headers = config.get('headers', {'Content-Type': 'application/json'})
-        self.timeout = config.get('timeout', 10)
+        # requests applies these separately to the TCP connect and to each socket read
+        self.connect_timeout = config.get('connect_timeout', 2)
+        self.read_timeout = config.get('read_timeout', config.get('timeout', 5))
+        self.latency = LatencyTracker('Webhook')
+        self.batch_timeout = config.get('batch_timeout', 30)
+        self.retry_attempts = config.get('retry_attempts', 4)
+        self.retry_base_delay = config.get('retry_base_delay', 0.5)
+        self.retry_max_delay = config.get('retry_max_delay', 30.0)
+        
+        # Independent breaker per channel so one outage doesn't affect the other
+        self.breaker = CircuitBreaker(
+            'Webhook',
+            failure_threshold=config.get('circuit_failure_threshold', 5),
+            recovery_timeout=config.get('circuit_recovery_timeout', 30)
+        )
+        
+        workers = config.get('workers', 4)
+        
+        # Caps queued + running deliveries so an alert storm can't grow without bound
+        self.bulkhead = Bulkhead('Webhook', max_concurrent=workers, max_queue=config.get('max_queue', 100))
+        
+        # Deliveries run on background workers so callers never block on the endpoint
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix='webhook-alerter'
+        )
+        
+        # Persistent session keeps connections to the endpoint alive across alerts
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(16, workers))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         if self.enabled:
             logger.info(f"Webhook alerter initialized (URL: {self.url})")
         else:
             logger.info("Webhook alerter disabled")
     
-    def send_alert(self, alert: Alert) -> bool:
+    def _build_payload(self, alert: Alert) -> Dict[str, Any]:
+        """Build the JSON payload for an alert."""
+        return {
+            'level': alert.level.value,
+            'title': alert.title,
+            'message': alert.message,
+            'metric': alert.metric,
+            'value': str(alert.value),
+            'threshold': str(alert.threshold),
+            'timestamp': alert.timestamp
+        }
+    
+    def _can_send(self) -> bool:
+        """Check that the alerter is enabled and configured."""
+        if not self.enabled:
+            logger.debug("Webhook alerter is disabled")
+            return False
+        
+        if not self.url:
+            logger.warning("No webhook URL configured")
+            return False
+        
+        if self.method not in ('POST', 'PUT'):
+            logger.error(f"Unsupported HTTP method: {self.method}")
+            return False
+        
+        return True
+    
+    def _do_post(self, alert: Alert, deadline: Optional[Deadline] = None) -> bool:
         """
-        Send an alert via webhook.
+        Deliver an alert to the webhook endpoint (runs on a worker thread).
         
         Args:
             alert: Alert object
+            deadline: Optional deadline; per-request timeouts shrink to fit it
         
         Returns:
             True if sent successfully, False otherwise
         """
-        if not self.enabled:
-            logger.debug("Webhook alerter is disabled")
+        if deadline is not None and deadline.expired():
+            logger.warning(f"Alert deadline exceeded, dropping webhook: {alert.title}")
             return False
         
-        if not self.url:
-            logger.warning("No webhook URL configured")
+        if not self.breaker.allow():
+            logger.debug(f"Webhook circuit open, dropping alert: {alert.title}")
             return False
         
         try:
-            # Prepare payload
-            payload = {
-                'level': alert.level.value,
-                'title': alert.title,
-                'message': alert.message,
-                'metric': alert.metric,
-                'value': str(alert.value),
-                'threshold': str(alert.threshold),
-                'timestamp': alert.timestamp
-            }
+            payload = self._build_payload(alert)
             
-            # Send request
-            if self.method == 'POST':
-                response = requests.post(
-                    self.url,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=self.timeout
-                )
-            elif self.method == 'PUT':
-                response = requests.put(
-                    self.url,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=self.timeout
-                )
-            else:
-                logger.error(f"Unsupported HTTP method: {self.method}")
-                return False
+            def post():
+                connect_timeout = _bounded_timeout(self.connect_timeout, deadline)
+                read_timeout = _bounded_timeout(self.read_timeout, deadline)
+                if connect_timeout <= 0 or read_timeout <= 0:
+                    raise requests.exceptions.Timeout("Alert deadline exceeded")
+                
+                start = time.monotonic()
+                try:
+                    response = self.session.request(
+                        self.method,
+                        self.url,
+                        json=payload,
+                        headers=self.headers,
+                        timeout=(connect_timeout, read_timeout)
+                    )
+                except requests.exceptions.ConnectionError:
+                    # The cached address may be stale; resolve again on the next attempt
+                    dns_cache.invalidate(urlsplit(self.url).hostname)
+                    raise
+                finally:
+                    self.latency.record(time.monotonic() - start)
+                response.raise_for_status()
+                return response
             
-            response.raise_for_status()
+            # Send request, retrying transient failures
+            _retry(
+                post,
+                _is_retryable_http,
+                max_attempts=self.retry_attempts,
+                base=self.retry_base_delay,
+                cap=self.retry_max_delay,
+                deadline=deadline
+            )
+            self.breaker.record_success()
             logger.info(f"Alert webhook sent: {alert.title}")
             return True
         
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to send webhook alert: {e}")
+            if _is_retryable_http(e):
+                self.breaker.record_failure()
+            else:
+                # The endpoint answered; the failure is specific to this request
+                self.breaker.record_success()
             return False
         except Exception as e:
             logger.error(f"Unexpected error sending webhook: {e}")
+            self.breaker.record_failure()
             return False
     
-    def send_alerts(self, alerts: List[Alert]) -> int:
+    def submit_alert(self, alert: Alert, deadline: Optional[Deadline] = None) -> Optional[Future]:
+        """
+        Queue an alert for background delivery.
+        
+        Args:
+            alert: Alert object
+            deadline: Optional deadline for the delivery
+        
+        Returns:
+            Future resolving to the delivery result, or None if not queued
+        """
+        if not self._can_send():
+            return None
+        
+        return self._submit(alert, deadline)
+    
+    def _submit(self, alert: Alert, deadline: Optional[Deadline]) -> Optional[Future]:
+        """Queue a delivery if the bulkhead has room."""
+        if not self.bulkhead.try_acquire():
+            logger.warning(f"Webhook bulkhead full, dropping alert: {alert.title}")
+            return None
+        
+        future = self._executor.submit(self._do_post, alert, deadline)
+        # Runs on completion or cancellation, so the slot is always returned
+        future.add_done_callback(lambda _: self.bulkhead.release())
+        return future
+    
+    def send_alert(self, alert: Alert, deadline: Optional[Deadline] = None) -> bool:
+        """
+        Send an alert via webhook without waiting for the response.
+        
+        Delivery success or failure is logged by the worker thread.
+        
+        Args:
+            alert: Alert object
+            deadline: Optional deadline for the delivery
+        
+        Returns:
+            True if the alert was queued for delivery, False otherwise
+        """
+        return self.submit_alert(alert, deadline) is not None
+    
+    def send_alerts(self, alerts: List[Alert], deadline: Optional[Deadline] = None) -> int:
         """
-        Send multiple alerts.
+        Send multiple alerts concurrently and wait for the results.
+        
+        Waits at most ``batch_timeout`` seconds in total (less if the deadline
+        is sooner); deliveries still pending after that are not counted.
         
         Args:
             alerts: List of alerts
+            deadline: Optional deadline for the whole batch
         
         Returns:
             Number of alerts sent successfully
         """
+        if not alerts or not self._can_send():
+            return 0
+        
+        futures = [self._submit(alert, deadline) for alert in alerts]
+        futures = [f for f in futures if f is not None]
+        if not futures:
+            return 0
+        
         sent_count = 0
-        for alert in alerts:
-            if self.send_alert(alert):
-                sent_count += 1
+        fail_count = 0
+        try:
+            for future in as_completed(futures, timeout=_bounded_timeout(self.batch_timeout, deadline)):
+                if future.result():
+                    sent_count += 1
+                    continue
+                
+                fail_count += 1
+                if _should_abort_batch(len(futures), fail_count):
+                    cancelled = sum(1 for f in futures if f.cancel())
+                    logger.warning(
+                        f"Aborting webhook batch after {fail_count} failures, "
+                        f"{cancelled} deliveries cancelled"
+                    )
+                    break
+        except FuturesTimeoutError:
+            pending = sum(1 for f in futures if not f.done())
+            logger.warning(f"Webhook batch deadline exceeded, {pending} deliveries still pending")
+        
         return sent_count
+    
+    def close(self):
+        """Stop accepting new deliveries and release pooled connections."""
+        self._executor.shutdown(wait=True)
+        self.session.close()
 
 
 class AlertDispatcher:
@@ -261,36 +1016,139 @@ class AlertDispatcher:
         self.email_alerter = EmailAlerter(alerts_config.get('email', {}))
         self.webhook_alerter = WebhookAlerter(alerts_config.get('webhook', {}))
         
+        # Upper bound on how long one dispatch may take across all channels
+        self.dispatch_timeout = alerts_config.get('dispatch_timeout', 60)
+        
+        # One worker per channel so a slow channel doesn't delay the other
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='alert-dispatch')
+        
+        # Identical (level, metric, threshold) alerts within this window are suppressed
+        self.dedup_window = alerts_config.get('dedup_window', 60)
+        self._seen: Dict[str, float] = {}
+        self._seen_lock = threading.Lock()
+        self._last_gc = time.monotonic()
+        
+        # Cache endpoint DNS lookups so new connections don't wait on the resolver
+        dns_ttl = alerts_config.get('dns_cache_ttl', 60)
+        if dns_ttl > 0:
+            hosts = []
+            if self.email_alerter.enabled:
+                hosts.append(self.email_alerter.smtp_host)
+            if self.webhook_alerter.enabled:
+                hosts.append(urlsplit(self.webhook_alerter.url).hostname)
+            if hosts:
+                dns_cache.enable(hosts, ttl=dns_ttl)
+        
+        # Fault injection for resilience testing (TOMCAT_MON_CHAOS=1 only)
+        if chaos_enabled():
+            install_chaos(self, config.get('chaos', {}))
+        
         logger.info("Alert dispatcher initialized")
     
-    def dispatch_alert(self, alert: Alert) -> Dict[str, bool]:
+    def _is_duplicate(self, alert: Alert) -> bool:
+        """
+        Check whether an identical alert was dispatched within the dedup window.
+        
+        Records the alert as seen when it is not a duplicate.
+        
+        Args:
+            alert: Alert to check
+        
+        Returns:
+            True if the alert should be suppressed
+        """
+        if self.dedup_window <= 0:
+            return False
+        
+        key = f"{alert.level.value}|{alert.metric}|{alert.threshold}"
+        now = time.monotonic()
+        
+        with self._seen_lock:
+            last = self._seen.get(key)
+            if last is not None and now - last < self.dedup_window:
+                return True
+            self._seen[key] = now
+            
+            # Forget expired keys once per window so the map stays small
+            if now - self._last_gc >= self.dedup_window:
+                self._seen = {k: t for k, t in self._seen.items() if now - t < self.dedup_window}
+                self._last_gc = now
+        
+        return False
+    
+    def dispatch_alert(self, alert: Alert, deadline: Optional[Deadline] = None) -> Dict[str, bool]:
         """
         Dispatch an alert to all enabled channels.
         
         Args:
             alert: Alert to dispatch
+            deadline: Optional deadline (defaults to ``dispatch_timeout`` from now)
         
         Returns:
             Dictionary with channel names and success status
         """
+        if self._is_duplicate(alert):
+            logger.debug(f"Suppressed duplicate alert: {alert.title}")
+            return {'email': False, 'webhook': False, 'deduped': True}
+        
+        if deadline is None:
+            deadline = Deadline(self.dispatch_timeout)
+        
         results = {
-            'email': self.email_alerter.send_alert(alert),
-            'webhook': self.webhook_alerter.send_alert(alert)
+            'email': self.email_alerter.send_alert(alert, deadline),
+            'webhook': self.webhook_alerter.send_alert(alert, deadline)
         }
         return results
     
-    def dispatch_alerts(self, alerts: List[Alert]) -> Dict[str, int]:
+    def dispatch_alerts(self, alerts: List[Alert], deadline: Optional[Deadline] = None) -> Dict[str, int]:
         """
-        Dispatch multiple alerts.
+        Dispatch multiple alerts to all channels in parallel.
         
         Args:
             alerts: List of alerts to dispatch
+            deadline: Optional deadline (defaults to ``dispatch_timeout`` from now)
         
         Returns:
             Dictionary with channel names and count of successful dispatches
         """
-        results = {
-            'email': self.email_alerter.send_alerts(alerts),
-            'webhook': self.webhook_alerter.send_alerts(alerts)
+        fresh = [alert for alert in alerts if not self._is_duplicate(alert)]
+        if len(fresh) < len(alerts):
+            logger.info(f"Suppressed {len(alerts) - len(fresh)} duplicate alert(s)")
+        alerts = fresh
+        if not alerts:
+            return {'email': 0, 'webhook': 0}
+        
+        if deadline is None:
+            deadline = Deadline(self.dispatch_timeout)
+        
+        futures = {
+            'email': self._executor.submit(self.email_alerter.send_alerts, alerts, deadline),
+            'webhook': self._executor.submit(self.webhook_alerter.send_alerts, alerts, deadline)
         }
+        
+        results = {}
+        for channel, future in futures.items():
+            try:
+                results[channel] = future.result(timeout=deadline.remaining())
+            except FuturesTimeoutError:
+                logger.warning(f"Alert deadline exceeded waiting for {channel} channel")
+                results[channel] = 0
         return results
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get recent delivery latencies per channel.
+        
+        Returns:
+            Dictionary mapping channel name to its latency summary
+        """
+        return {
+            'email': self.email_alerter.latency.summary(),
+            'webhook': self.webhook_alerter.latency.summary()
+        }
+    
+    def close(self):
+        """Release channel resources (SMTP session, HTTP pool, worker threads)."""
+        self._executor.shutdown(wait=True)
+        self.email_alerter.close()
+        self.webhook_alerter.close()
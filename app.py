@@ -1,8 +1,11 @@
 """
 Flask web UI for Tomcat Monitoring Toolkit.
 """
+import atexit
 import logging
-from flask import Flask, render_template, jsonify
+import time
+import orjson
+from flask import Flask, Response, render_template, jsonify
 from monitor import MonitoringCoordinator
 from config_manager import load_config
 
@@ -14,6 +17,12 @@ app = Flask(__name__)
 # Global coordinator instance
 coordinator = None
 
+MB_PER_BYTE = 1.0 / (1024 * 1024)
+
+# Serialized API responses, keyed by endpoint: (body, coordinator generation, created_at)
+CACHE_TTL_SECONDS = 0.5
+_response_cache = {}
+
 
 def init_app(config_path: str = 'config.yaml'):
     """
@@ -31,13 +40,60 @@ def init_app(config_path: str = 'config.yaml'):
     coordinator = MonitoringCoordinator(config)
     
     # Start monitoring
-    monitoring_config = config['monitoring']
-    interval = monitoring_config.get('thread_dump_interval', 30)
-    coordinator.start_monitoring(interval=interval)
+    coordinator.start_monitoring(interval=config.monitoring.thread_dump_interval)
+    
+    # Release pooled alerting and JMX connections on shutdown
+    atexit.register(coordinator.alert_dispatcher.close)
+    atexit.register(coordinator.jmx_monitor.close)
+    atexit.register(coordinator.log_parser.close)
     
     logger.info("Flask app initialized")
 
 
+def _dumps(obj) -> bytes:
+    """Serialize to JSON with orjson (int keys such as status codes allowed)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _json_response(obj) -> Response:
+    """Build a JSON response without going through the stdlib encoder."""
+    return Response(_dumps(obj), mimetype='application/json')
+
+
+def _cached_json(name: str, build) -> Response:
+    """
+    Serve a JSON body shared by all clients for a short time.
+    
+    Args:
+        name: Cache key (endpoint name)
+        build: Callable returning the JSON-serializable payload
+    """
+    return _cached_body(name, lambda: _dumps(build()))
+
+
+def _cached_body(name: str, render) -> Response:
+    """
+    Serve an already-serialized JSON body shared by all clients for a short time.
+    
+    The body is rebuilt when it is older than CACHE_TTL_SECONDS or the
+    coordinator has completed a new monitoring cycle since it was built.
+    
+    Args:
+        name: Cache key (endpoint name)
+        render: Callable returning the JSON body as bytes
+    """
+    now = time.monotonic()
+    generation = coordinator.generation
+    
+    cached = _response_cache.get(name)
+    if cached is not None and cached[1] == generation and now - cached[2] < CACHE_TTL_SECONDS:
+        return Response(cached[0], mimetype='application/json')
+    
+    body = render()
+    _response_cache[name] = (body, generation, now)
+    return Response(body, mimetype='application/json')
+
+
 @app.route('/')
 def index():
     """Main dashboard page."""
@@ -63,8 +119,7 @@ def api_status():
         return jsonify({'error': 'Coordinator not initialized'}), 500
     
     try:
-        status = coordinator.get_current_status()
-        return jsonify(status)
+        return _cached_body('status', coordinator.get_current_status_json)
     except Exception as e:
         logger.error(f"Error getting status: {e}")
         return jsonify({'error': str(e)}), 500
@@ -77,8 +132,7 @@ def api_metrics():
         return jsonify({'error': 'Coordinator not initialized'}), 500
     
     try:
-        metrics = coordinator.current_metrics
-        return jsonify(metrics)
+        return _cached_json('metrics', lambda: coordinator.current_metrics)
     except Exception as e:
         logger.error(f"Error getting metrics: {e}")
         return jsonify({'error': str(e)}), 500
@@ -91,8 +145,7 @@ def api_health():
         return jsonify({'error': 'Coordinator not initialized'}), 500
     
     try:
-        health = coordinator.current_health
-        return jsonify(health)
+        return _cached_json('health', lambda: coordinator.current_health)
     except Exception as e:
         logger.error(f"Error getting health: {e}")
         return jsonify({'error': str(e)}), 500
@@ -106,7 +159,7 @@ def api_alerts():
     
     try:
         alerts = coordinator.alert_manager.get_active_alerts()
-        return jsonify({
+        return _json_response({
             'alerts': [
                 {
                     'level': a.level.value,
@@ -131,21 +184,21 @@ def api_heap_trend():
     if coordinator is None:
         return jsonify({'error': 'Coordinator not initialized'}), 500
     
-    try:
-        heap_history = coordinator.jmx_monitor.heap_history
+    def build():
+        heap_history = list(coordinator.jmx_monitor.heap_history)
         
-        # Convert to JSON-serializable format
-        trend_data = [
-            {
-                'timestamp': h.timestamp,
-                'used_mb': h.used / (1024 * 1024),
-                'max_mb': h.max / (1024 * 1024),
-                'usage_percent': h.usage_percent * 100
-            }
-            for h in heap_history
-        ]
+        # Columnar layout: one array per series, which is also what the chart consumes
+        trend_data = {
+            'timestamp': [h.timestamp for h in heap_history],
+            'used_mb': [h.used * MB_PER_BYTE for h in heap_history],
+            'max_mb': [h.max * MB_PER_BYTE for h in heap_history],
+            'usage_percent': [h.usage_percent * 100 for h in heap_history]
+        }
         
-        return jsonify({'data': trend_data})
+        return {'data': trend_data}
+    
+    try:
+        return _cached_json('heap_trend', build)
     except Exception as e:
         logger.error(f"Error getting heap trend: {e}")
         return jsonify({'error': str(e)}), 500
@@ -157,10 +210,10 @@ def api_slow_requests():
     if coordinator is None:
         return jsonify({'error': 'Coordinator not initialized'}), 500
     
-    try:
+    def build():
         slow_requests = coordinator.log_parser.get_slow_requests(limit=50)
         
-        return jsonify({
+        return {
             'requests': [
                 {
                     'timestamp': r.timestamp.isoformat(),
@@ -172,7 +225,10 @@ def api_slow_requests():
                 }
                 for r in slow_requests
             ]
-        })
+        }
+    
+    try:
+        return _cached_json('slow_requests', build)
     except Exception as e:
         logger.error(f"Error getting slow requests: {e}")
         return jsonify({'error': str(e)}), 500
@@ -188,10 +244,15 @@ if __name__ == '__main__':
     # Initialize app
     init_app()
     
-    # Run Flask
-    ui_config = coordinator.config['ui']
-    app.run(
-        host=ui_config.get('host', '0.0.0.0'),
-        port=ui_config.get('port', 5000),
-        debug=ui_config.get('debug', False)
-    )
+    ui_config = coordinator.config.ui
+    if ui_config.debug:
+        # Flask development server (single process, debugger enabled)
+        app.run(
+            host=ui_config.host,
+            port=ui_config.port,
+            debug=True
+        )
+    else:
+        # Production WSGI server; one process (the monitor lives in it), many threads
+        from waitress import serve
+        serve(app, host=ui_config.host, port=ui_config.port, threads=ui_config.threads)
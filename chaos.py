@@ -0,0 +1,208 @@
+"""
+Fault injection for the alert delivery channels.
+
+Used to check that retries, circuit breakers and timeouts behave as intended
+without waiting for a real outage. Enabled only when the TOMCAT_MON_CHAOS
+environment variable is set to 1 -- never turn this on in production.
+
+Example configuration (config.yaml):
+
+    chaos:
+      seed: 42
+      slow_seconds: 3
+      rules:
+        - fault: http_5xx
+          probability: 0.2
+        - fault: network_timeout
+          probability: 0.1
+"""
+import logging
+import os
+import random
+import smtplib
+import threading
+import time
+import requests
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+CHAOS_ENV_VAR = 'TOMCAT_MON_CHAOS'
+
+
+class FaultType(Enum):
+    """Faults that can be injected."""
+    NETWORK_TIMEOUT = "network_timeout"
+    HTTP_5XX = "http_5xx"
+    HTTP_429 = "http_429"
+    SLOW_RESPONSE = "slow_response"
+    PARTIAL_RESPONSE = "partial_response"
+    MALFORMED_JSON = "malformed_json"
+
+
+@dataclass
+class ChaosRule:
+    """Inject a fault with the given probability on each call."""
+    fault_type: FaultType
+    probability: float
+
+
+class ChaosMiddleware:
+    """
+    Decides which fault (if any) to inject on each call.
+    
+    Rules are evaluated in order and the first one that fires wins. The RNG
+    is seeded so a run can be reproduced exactly.
+    """
+    
+    def __init__(self, rules: List[ChaosRule], seed: Optional[int] = None, slow_seconds: float = 3.0):
+        """
+        Initialize chaos middleware.
+        
+        Args:
+            rules: Fault rules
+            seed: RNG seed for reproducible runs
+            slow_seconds: Delay added by SLOW_RESPONSE faults
+        """
+        self.rules = rules
+        self.slow_seconds = slow_seconds
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ChaosMiddleware':
+        """Build middleware from the ``chaos`` config section."""
+        rules = [
+            ChaosRule(FaultType(rule['fault']), float(rule.get('probability', 0)))
+            for rule in config.get('rules', [])
+        ]
+        return cls(rules, seed=config.get('seed'), slow_seconds=config.get('slow_seconds', 3.0))
+    
+    def pick(self) -> Optional[FaultType]:
+        """Choose the fault for this call, or None to let it through."""
+        with self._lock:
+            for rule in self.rules:
+                if self._rng.random() < rule.probability:
+                    return rule.fault_type
+        return None
+
+
+class ChaosHTTPAdapter(HTTPAdapter):
+    """HTTP adapter that injects faults before (or instead of) the real request."""
+    
+    def __init__(self, middleware: ChaosMiddleware, **kwargs):
+        """
+        Initialize chaos adapter.
+        
+        Args:
+            middleware: Fault decision source
+            **kwargs: Passed through to HTTPAdapter
+        """
+        self.middleware = middleware
+        super().__init__(**kwargs)
+    
+    def _fake_response(self, request, status_code: int, body: bytes = b'') -> requests.Response:
+        """Build a response without touching the network."""
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = body
+        response.url = request.url
+        response.request = request
+        response.headers['Content-Type'] = 'application/json'
+        if status_code == 429:
+            response.headers['Retry-After'] = '1'
+        return response
+    
+    def send(self, request, **kwargs):
+        """Send a request, possibly replacing it with an injected fault."""
+        fault = self.middleware.pick()
+        if fault is not None:
+            logger.warning(f"Chaos: injecting {fault.value} into {request.method} {request.url}")
+        
+        if fault == FaultType.NETWORK_TIMEOUT:
+            raise requests.exceptions.ConnectTimeout("Chaos: injected network timeout", request=request)
+        if fault == FaultType.HTTP_5XX:
+            return self._fake_response(request, 503, b'{"error": "service unavailable"}')
+        if fault == FaultType.HTTP_429:
+            return self._fake_response(request, 429, b'{"error": "too many requests"}')
+        if fault == FaultType.PARTIAL_RESPONSE:
+            raise requests.exceptions.ChunkedEncodingError("Chaos: connection broken mid-response", request=request)
+        if fault == FaultType.MALFORMED_JSON:
+            return self._fake_response(request, 200, b'{"ok": tru')
+        if fault == FaultType.SLOW_RESPONSE:
+            time.sleep(self.middleware.slow_seconds)
+        
+        return super().send(request, **kwargs)
+
+
+class ChaosSMTP(smtplib.SMTP):
+    """SMTP client that injects faults into message sends."""
+    
+    def __init__(self, middleware: ChaosMiddleware, *args, **kwargs):
+        """
+        Initialize chaos SMTP client.
+        
+        Args:
+            middleware: Fault decision source
+            *args, **kwargs: Passed through to smtplib.SMTP
+        """
+        self.middleware = middleware
+        super().__init__(*args, **kwargs)
+    
+    def sendmail(self, from_addr, to_addrs, msg, *args, **kwargs):
+        """Send a message, possibly failing it with an injected fault."""
+        fault = self.middleware.pick()
+        if fault is not None:
+            logger.warning(f"Chaos: injecting {fault.value} into SMTP send")
+        
+        if fault == FaultType.NETWORK_TIMEOUT:
+            raise TimeoutError("Chaos: injected network timeout")
+        if fault == FaultType.HTTP_5XX:
+            raise smtplib.SMTPResponseException(451, b"Chaos: local error in processing")
+        if fault == FaultType.HTTP_429:
+            raise smtplib.SMTPResponseException(421, b"Chaos: too many connections")
+        if fault == FaultType.PARTIAL_RESPONSE:
+            self.close()
+            raise smtplib.SMTPServerDisconnected("Chaos: connection dropped mid-transaction")
+        if fault == FaultType.MALFORMED_JSON:
+            raise smtplib.SMTPResponseException(-1, b"Chaos: malformed server reply")
+        if fault == FaultType.SLOW_RESPONSE:
+            time.sleep(self.middleware.slow_seconds)
+        
+        return super().sendmail(from_addr, to_addrs, msg, *args, **kwargs)
+
+
+def chaos_enabled() -> bool:
+    """Check whether fault injection was requested via the environment."""
+    return os.environ.get(CHAOS_ENV_VAR) == '1'
+
+
+def install_chaos(dispatcher, config: Dict[str, Any]) -> ChaosMiddleware:
+    """
+    Route an AlertDispatcher's email and webhook traffic through fault injection.
+    
+    Args:
+        dispatcher: AlertDispatcher to instrument
+        config: ``chaos`` configuration section
+    
+    Returns:
+        The installed middleware
+    """
+    middleware = ChaosMiddleware.from_config(config)
+    
+    webhook = dispatcher.webhook_alerter
+    adapter = ChaosHTTPAdapter(middleware, pool_connections=4, pool_maxsize=max(16, webhook.bulkhead.max_concurrent))
+    webhook.session.mount('http://', adapter)
+    webhook.session.mount('https://', adapter)
+    
+    dispatcher.email_alerter.smtp_factory = (
+        lambda *args, **kwargs: ChaosSMTP(middleware, *args, **kwargs)
+    )
+    
+    logger.warning(
+        f"Chaos fault injection ENABLED ({len(middleware.rules)} rules, seed={config.get('seed')})"
+    )
+    return middleware
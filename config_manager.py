@@ -1,20 +1,89 @@
 """
 Configuration management module with fail-fast validation.
 """
+import copy
 import os
 import sys
 import yaml
-from typing import Dict, Any
+from dataclasses import dataclass, fields
+from typing import Dict, Any, Tuple, Iterator
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Use the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed configs keyed by (path, mtime_ns, size) so unchanged files aren't re-parsed
+_config_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def _flatten(value: Any, prefix: Tuple = ()) -> Iterator[Tuple[Tuple, Any]]:
+    """Yield (key path, value) for every node of a nested dict, sections included."""
+    yield prefix, value
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _flatten(child, prefix + (key,))
+
 
 class ConfigurationError(Exception):
     """Raised when configuration validation fails."""
     pass
 
 
+@dataclass(frozen=True, slots=True)
+class JmxConfig:
+    """JMX connection settings."""
+    host: str
+    port: int
+    readonly: bool = True
+    connection_timeout: int = 10
+
+
+@dataclass(frozen=True, slots=True)
+class TomcatConfig:
+    """Tomcat settings."""
+    access_log_path: str
+    slow_request_threshold: int
+    thread_pool_warn_threshold: float = 0.7
+    thread_pool_critical_threshold: float = 0.9
+
+
+@dataclass(frozen=True, slots=True)
+class MonitoringConfig:
+    """Monitoring thresholds."""
+    heap_warn_threshold: float
+    heap_critical_threshold: float
+    oldgen_warn_threshold: float = 0.75
+    oldgen_critical_threshold: float = 0.9
+    oom_prediction_enabled: bool = True
+    heap_growth_window: int = 300
+    oom_prediction_threshold: int = 3600
+    thread_dump_interval: int = 30
+    blocked_thread_threshold: int = 5
+    cpu_warn_threshold: float = 0.8
+    cpu_critical_threshold: float = 0.95
+    memory_warn_threshold: float = 0.8
+    memory_critical_threshold: float = 0.9
+    disk_warn_threshold: float = 0.8
+    disk_critical_threshold: float = 0.9
+
+
+@dataclass(frozen=True, slots=True)
+class UIConfig:
+    """Flask UI settings."""
+    host: str
+    port: int
+    debug: bool = False
+    threads: int = 16
+
+
+def _section(cls, data: Dict[str, Any]):
+    """Build a typed config section, ignoring keys the section doesn't declare."""
+    names = {f.name for f in fields(cls)}
+    return cls(**{k: v for k, v in data.items() if k in names})
+
+
 class Config:
     """Configuration manager with validation."""
     
@@ -31,6 +100,15 @@ class Config:
         self.config_path = config_path
         self.config = self._load_config()
         self._validate_config()
+        
+        # Typed, immutable views of the validated sections
+        self.jmx = _section(JmxConfig, self.config['jmx'])
+        self.tomcat = _section(TomcatConfig, self.config['tomcat'])
+        self.monitoring = _section(MonitoringConfig, self.config['monitoring'])
+        self.ui = _section(UIConfig, self.config['ui'])
+        
+        # Every key path resolved once, so get() is a single dict lookup
+        self._flat = dict(_flatten(self.config))
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -38,13 +116,20 @@ class Config:
             raise ConfigurationError(f"Configuration file not found: {self.config_path}")
         
         try:
+            st = os.stat(self.config_path)
+            key = (os.path.abspath(self.config_path), st.st_mtime_ns, st.st_size)
+            if key in _config_cache:
+                # Callers may mutate their config; hand out a private copy
+                return copy.deepcopy(_config_cache[key])
+            
             with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
             
             if not config:
                 raise ConfigurationError("Configuration file is empty")
             
-            return config
+            _config_cache[key] = config
+            return copy.deepcopy(config)
         except yaml.YAMLError as e:
             raise ConfigurationError(f"Invalid YAML syntax: {e}")
         except Exception as e:
@@ -120,16 +205,12 @@ class Config:
     
     def get(self, *keys, default=None):
         """Get configuration value by nested keys."""
-        value = self.config
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        return value
+        return self._flat.get(keys, default)
     
     def __getitem__(self, key):
-        """Get configuration section."""
+        """Get configuration section, or a nested value for a tuple of keys."""
+        if isinstance(key, tuple):
+            return self._flat[key]
         return self.config[key]
 
 
@@ -0,0 +1,102 @@
+"""
+TTL cache for DNS lookups of the alert endpoints.
+
+Every new SMTP session and every new webhook connection resolves its host
+through socket.getaddrinfo, which can block for a long time when the
+resolver is slow. The cache wraps getaddrinfo for a small set of registered
+hosts only; libraries still connect by hostname, so TLS SNI/certificate
+checks and the HTTP Host header are unaffected.
+"""
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DNSCache:
+    """LRU + TTL cache in front of socket.getaddrinfo."""
+    
+    def __init__(self, ttl: float = 60.0, maxsize: int = 128):
+        """
+        Initialize DNS cache.
+        
+        Args:
+            ttl: Seconds a resolved address list stays valid
+            maxsize: Maximum number of cached lookups
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._hosts = set()
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._resolve = socket.getaddrinfo
+    
+    def add_hosts(self, hosts: Iterable[str]):
+        """Start caching lookups for the given hostnames."""
+        with self._lock:
+            self._hosts.update(host.lower() for host in hosts if host)
+    
+    def invalidate(self, host: str):
+        """Drop cached addresses for a host so the next connect resolves it again."""
+        host = host.lower()
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == host]:
+                del self._entries[key]
+    
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """Drop-in replacement for socket.getaddrinfo."""
+        if not isinstance(host, str) or host.lower() not in self._hosts:
+            return self._resolve(host, port, family, type, proto, flags)
+        
+        key = (host.lower(), port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return list(entry[1])
+        
+        # Resolve outside the lock; failures are not cached
+        result = self._resolve(host, port, family, type, proto, flags)
+        
+        with self._lock:
+            self._entries[key] = (now + self.ttl, tuple(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+
+_cache: Optional[DNSCache] = None
+_install_lock = threading.Lock()
+
+
+def enable(hosts: Iterable[str], ttl: float = 60.0) -> DNSCache:
+    """
+    Install the process-wide DNS cache (once) and register hosts with it.
+    
+    Args:
+        hosts: Hostnames whose lookups should be cached
+        ttl: Seconds a resolved address list stays valid
+    
+    Returns:
+        The installed cache
+    """
+    global _cache
+    with _install_lock:
+        if _cache is None:
+            _cache = DNSCache(ttl=ttl)
+            socket.getaddrinfo = _cache.getaddrinfo
+            logger.info(f"DNS cache enabled (TTL {ttl}s)")
+    _cache.add_hosts(hosts)
+    return _cache
+
+
+def invalidate(host: Any):
+    """Forget cached addresses for a host (no-op if the cache is not installed)."""
+    if _cache is not None and isinstance(host, str) and host:
+        _cache.invalidate(host)
@@ -2,13 +2,90 @@
 Health scoring and alerting system.
 """
 import logging
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from array import array
+from bisect import bisect_right
+from collections import deque
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only default for missing metric sections (avoids a new {} per lookup)
+_EMPTY = MappingProxyType({})
+
+# Stuck thread counts split into buckets [0], [1-4], [5-9], [10+] with these scores;
+# the last bucket also makes the stuck-thread alert critical
+_STUCK_THREAD_BOUNDS = (1, 5, 10)
+_STUCK_THREAD_SCORES = (100, 80, 50, 0)
+
+# Message templates for the alerts that aren't driven by AlertManager.THRESHOLD_RULES
+_MSG_TEMPLATES = {
+    'oom_prediction': "OOM predicted in {minutes:.1f} minutes",
+    'stuck_threads': "{count} threads are stuck or blocked",
+}
+
+# Upper bound on alerts kept in AlertManager.alerts, whatever their age
+MAX_ACTIVE_ALERTS = 10000
+
+# Scores below 70 are critical, below 90 warning, otherwise healthy
+_HEALTH_STATUS_BOUNDS = (70, 90)
+_HEALTH_STATUSES = ('critical', 'warning', 'healthy')
+
+
+def _score_coefficients(warn_threshold: float, critical_threshold: float) -> Tuple[float, ...]:
+    """
+    Precompute the per-segment slopes used by _score_value.
+    
+    Thresholds are fixed after startup, so the divisions are done once here
+    and scoring only multiplies.
+    
+    Args:
+        warn_threshold: Warning threshold
+        critical_threshold: Critical threshold
+    
+    Returns:
+        (healthy slope, warn, warning slope, critical, critical slope)
+    """
+    warning_range = critical_threshold - warn_threshold
+    critical_range = 1.0 - critical_threshold
+    return (
+        10 / warn_threshold,
+        warn_threshold,
+        20 / warning_range if warning_range > 0 else float('inf'),
+        critical_threshold,
+        70 / critical_range if critical_range > 0 else float('inf'),
+    )
+
+
+def _score_value(value: float, coefficients: Tuple[float, ...]) -> float:
+    """
+    Piecewise scoring kernel shared by all components (0-100).
+    
+    Kept at module level so the hot loop calls a plain function with no
+    attribute lookups.
+    
+    Args:
+        value: Current metric value (0-1 normalized)
+        coefficients: Output of _score_coefficients for the metric's thresholds
+    
+    Returns:
+        Score from 0-100
+    """
+    healthy_slope, warn_threshold, warning_slope, critical_threshold, critical_slope = coefficients
+    if value <= warn_threshold:
+        # Healthy range: linear from 100 at 0% to 90 at warn threshold
+        return 100 - value * healthy_slope
+    elif value <= critical_threshold:
+        # Warning range: linear from 90 at warn to 70 at critical
+        return 90 - (value - warn_threshold) * warning_slope
+    else:
+        # Critical range: exponential decay from 70 at critical to 0 at 100%
+        return max(0, 70 - (value - critical_threshold) * critical_slope)
+
 
 class AlertLevel(Enum):
     """Alert severity levels."""
@@ -17,7 +94,7 @@ class AlertLevel(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Alert:
     """Alert object."""
     level: AlertLevel
@@ -29,6 +106,28 @@ class Alert:
     timestamp: float
 
 
+@dataclass(frozen=True, slots=True)
+class AlertRule:
+    """
+    Threshold rule for a utilization-style metric.
+    
+    The value at ``path`` in the metrics dict (divided by ``divisor``) is
+    compared against the critical threshold, then the optional warning one.
+    ``message`` is a format template given the value as a percentage (``pct``).
+    """
+    metric: str
+    path: Tuple[str, ...]
+    message: str
+    config_section: str
+    critical_key: str
+    critical_default: float
+    critical_title: str
+    warn_key: Optional[str] = None
+    warn_default: Optional[float] = None
+    warn_title: Optional[str] = None
+    divisor: float = 1
+
+
 class HealthScorer:
     """
     Calculate health score based on multiple metrics.
@@ -67,6 +166,16 @@ class HealthScorer:
         self.memory_warn = monitoring.get('memory_warn_threshold', 0.8)
         self.memory_critical = monitoring.get('memory_critical_threshold', 0.9)
         
+        # (name, scoring coefficients, weight) per scored component, in metric gathering order
+        self._components = (
+            ('heap', _score_coefficients(self.heap_warn, self.heap_critical), self.heap_weight),
+            ('thread_pool', _score_coefficients(self.thread_pool_warn, self.thread_pool_critical),
+             self.thread_pool_weight),
+            ('cpu', _score_coefficients(self.cpu_warn, self.cpu_critical), self.cpu_weight),
+            ('memory', _score_coefficients(self.memory_warn, self.memory_critical), self.memory_weight),
+        )
+        self._warns = tuple(coefficients[1] for _, coefficients, _ in self._components)
+        
         logger.info("Health scorer initialized")
     
     def _score_metric(self, value: float, warn_threshold: float, critical_threshold: float) -> float:
@@ -81,19 +190,7 @@ class HealthScorer:
         Returns:
             Score from 0-100
         """
-        if value <= warn_threshold:
-            # Healthy range: linear from 100 at 0% to 90 at warn threshold
-            return 100 - (value / warn_threshold) * 10
-        elif value <= critical_threshold:
-            # Warning range: linear from 90 at warn to 70 at critical
-            range_size = critical_threshold - warn_threshold
-            position = (value - warn_threshold) / range_size
-            return 90 - (position * 20)
-        else:
-            # Critical range: exponential decay from 70 at critical to 0 at 100%
-            range_size = 1.0 - critical_threshold
-            position = (value - critical_threshold) / range_size
-            return max(0, 70 * (1 - position))
+        return _score_value(value, _score_coefficients(warn_threshold, critical_threshold))
     
     def calculate_health_score(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -105,47 +202,35 @@ class HealthScorer:
         Returns:
             Dictionary with overall score and component scores
         """
-        scores = {}
+        os_metrics = metrics.get('os', _EMPTY)
         
-        # Heap score
-        heap_usage = metrics.get('heap', {}).get('usage_percent', 0)
-        scores['heap'] = self._score_metric(heap_usage, self.heap_warn, self.heap_critical)
-        
-        # Thread pool score
-        thread_pool_util = metrics.get('thread_pool', {}).get('utilization', 0)
-        scores['thread_pool'] = self._score_metric(
-            thread_pool_util,
-            self.thread_pool_warn,
-            self.thread_pool_critical
+        # Normalized (0-1) values in the same order as self._components
+        values = (
+            metrics.get('heap', _EMPTY).get('usage_percent', 0),
+            metrics.get('thread_pool', _EMPTY).get('utilization', 0),
+            os_metrics.get('cpu', _EMPTY).get('cpu_percent', 0) / 100,
+            os_metrics.get('memory', _EMPTY).get('percent', 0) / 100,
         )
         
-        # CPU score
-        cpu_usage = metrics.get('os', {}).get('cpu', {}).get('cpu_percent', 0) / 100
-        scores['cpu'] = self._score_metric(cpu_usage, self.cpu_warn, self.cpu_critical)
-        
-        # Memory score
-        memory_usage = metrics.get('os', {}).get('memory', {}).get('percent', 0) / 100
-        scores['memory'] = self._score_metric(memory_usage, self.memory_warn, self.memory_critical)
+        # Score every component and accumulate the weighted total in one pass
+        scores = {}
+        overall_score = 0.0
+        if all(value <= warn for value, warn in zip(values, self._warns)):
+            # Steady state: everything is in the healthy range, which is a plain linear ramp
+            for (name, coefficients, weight), value in zip(self._components, values):
+                score = 100 - value * coefficients[0]
+                scores[name] = score
+                overall_score += score * weight
+        else:
+            for (name, coefficients, weight), value in zip(self._components, values):
+                score = _score_value(value, coefficients)
+                scores[name] = score
+                overall_score += score * weight
         
         # Stuck threads score (inverted - more stuck threads = lower score)
-        stuck_threads = metrics.get('stuck_threads', 0)
-        if stuck_threads == 0:
-            scores['stuck_threads'] = 100
-        elif stuck_threads < 5:
-            scores['stuck_threads'] = 80
-        elif stuck_threads < 10:
-            scores['stuck_threads'] = 50
-        else:
-            scores['stuck_threads'] = 0
-        
-        # Calculate weighted overall score
-        overall_score = (
-            scores['heap'] * self.heap_weight +
-            scores['thread_pool'] * self.thread_pool_weight +
-            scores['cpu'] * self.cpu_weight +
-            scores['memory'] * self.memory_weight +
-            scores['stuck_threads'] * self.stuck_threads_weight
-        )
+        stuck_score = _STUCK_THREAD_SCORES[bisect_right(_STUCK_THREAD_BOUNDS, metrics.get('stuck_threads', 0))]
+        scores['stuck_threads'] = stuck_score
+        overall_score += stuck_score * self.stuck_threads_weight
         
         return {
             'overall_score': round(overall_score, 2),
@@ -156,12 +241,7 @@ class HealthScorer:
     
     def _get_health_status(self, score: float) -> str:
         """Get health status from score."""
-        if score >= 90:
-            return 'healthy'
-        elif score >= 70:
-            return 'warning'
-        else:
-            return 'critical'
+        return _HEALTH_STATUSES[bisect_right(_HEALTH_STATUS_BOUNDS, score)]
 
 
 class AlertManager:
@@ -169,21 +249,86 @@ class AlertManager:
     Manage alerts and alert throttling.
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    # Simple threshold checks; OOM prediction and stuck threads are handled separately
+    THRESHOLD_RULES = (
+        AlertRule(
+            metric="heap_usage", path=('heap', 'usage_percent'),
+            message="Heap usage is at {pct:.1f}%",
+            config_section='monitoring',
+            critical_key='heap_critical_threshold', critical_default=0.85,
+            critical_title="Critical Heap Usage",
+            warn_key='heap_warn_threshold', warn_default=0.7, warn_title="High Heap Usage"
+        ),
+        AlertRule(
+            metric="oldgen_usage", path=('oldgen', 'usage_percent'),
+            message="OldGen usage is at {pct:.1f}%",
+            config_section='monitoring',
+            critical_key='oldgen_critical_threshold', critical_default=0.9,
+            critical_title="Critical OldGen Usage"
+        ),
+        AlertRule(
+            metric="thread_pool_utilization", path=('thread_pool', 'utilization'),
+            message="Thread pool utilization is at {pct:.1f}%",
+            config_section='tomcat',
+            critical_key='thread_pool_critical_threshold', critical_default=0.9,
+            critical_title="Critical Thread Pool Saturation",
+            warn_key='thread_pool_warn_threshold', warn_default=0.7,
+            warn_title="High Thread Pool Utilization"
+        ),
+        AlertRule(
+            metric="cpu_usage", path=('os', 'cpu', 'cpu_percent'),
+            message="CPU usage is at {pct:.1f}%",
+            config_section='monitoring',
+            critical_key='cpu_critical_threshold', critical_default=0.95,
+            critical_title="Critical CPU Usage",
+            divisor=100
+        ),
+        AlertRule(
+            metric="memory_usage", path=('os', 'memory', 'percent'),
+            message="Memory usage is at {pct:.1f}%",
+            config_section='monitoring',
+            critical_key='memory_critical_threshold', critical_default=0.9,
+            critical_title="Critical Memory Usage",
+            divisor=100
+        ),
+    )
+    # The first THRESHOLD_RULES entries (heap, OldGen) are checked before OOM and stuck threads
+    JVM_MEMORY_RULE_COUNT = 2
+    
+    def __init__(self, config: Dict[str, Any], sink: Optional[Callable[[Alert], None]] = None):
         """
         Initialize alert manager.
         
         Args:
             config: Configuration dictionary
+            sink: Optional callable receiving every accepted alert (e.g. a log
+                or metrics exporter); when given, no in-memory history is kept
         """
         self.config = config
+        # Alerts in arrival order with a parallel array of their timestamps, so
+        # age cutoffs are a binary search instead of a scan
         self.alerts = []
-        self.alert_history = []
+        self._alert_ts = array('d')
+        self._alerts_lock = threading.Lock()
+        
+        # Recent accepted alerts, bounded so a long-running monitor doesn't grow forever
+        self.sink = sink
+        self.alert_history = deque(maxlen=config.get('alerts', {}).get('history_size', 10000))
         
         # Alert throttling
         self.throttle_minutes = config.get('alerts', {}).get('throttle_minutes', 15)
         self.last_alert_times = {}
         
+        # Resolve every rule once: (rule, parent keys, leaf key, critical, warn or None)
+        self._rules = []
+        for rule in self.THRESHOLD_RULES:
+            section = config.get(rule.config_section, {})
+            critical = float(section.get(rule.critical_key, rule.critical_default))
+            warn = float(section.get(rule.warn_key, rule.warn_default)) if rule.warn_key else None
+            self._rules.append((rule, rule.path[:-1], rule.path[-1], critical, warn))
+        
+        self.oom_threshold = float(config.get('monitoring', {}).get('oom_prediction_threshold', 3600))
+        
         logger.info("Alert manager initialized")
     
     def check_metrics_for_alerts(self, metrics: Dict[str, Any]) -> List[Alert]:
@@ -197,145 +342,114 @@ class AlertManager:
             List of new alerts
         """
         new_alerts = []
-        monitoring = self.config.get('monitoring', {})
-        tomcat = self.config.get('tomcat', {})
+        now = time.time()
         
-        # Check heap usage
-        heap_usage = metrics.get('heap', {}).get('usage_percent', 0)
-        if heap_usage >= monitoring.get('heap_critical_threshold', 0.85):
-            alert = Alert(
-                level=AlertLevel.CRITICAL,
-                title="Critical Heap Usage",
-                message=f"Heap usage is at {heap_usage*100:.1f}%",
-                metric="heap_usage",
-                value=heap_usage,
-                threshold=monitoring.get('heap_critical_threshold'),
-                timestamp=time.time()
-            )
-            new_alerts.append(alert)
-        elif heap_usage >= monitoring.get('heap_warn_threshold', 0.7):
-            alert = Alert(
-                level=AlertLevel.WARNING,
-                title="High Heap Usage",
-                message=f"Heap usage is at {heap_usage*100:.1f}%",
-                metric="heap_usage",
-                value=heap_usage,
-                threshold=monitoring.get('heap_warn_threshold'),
-                timestamp=time.time()
-            )
-            new_alerts.append(alert)
+        # Alerts keep their long-standing order: heap, OldGen, OOM, stuck threads,
+        # thread pool, CPU, memory
+        split = self.JVM_MEMORY_RULE_COUNT
         
-        # Check OldGen usage
-        oldgen_usage = metrics.get('oldgen', {}).get('usage_percent', 0)
-        if oldgen_usage >= monitoring.get('oldgen_critical_threshold', 0.9):
-            alert = Alert(
-                level=AlertLevel.CRITICAL,
-                title="Critical OldGen Usage",
-                message=f"OldGen usage is at {oldgen_usage*100:.1f}%",
-                metric="oldgen_usage",
-                value=oldgen_usage,
-                threshold=monitoring.get('oldgen_critical_threshold'),
-                timestamp=time.time()
-            )
-            new_alerts.append(alert)
+        # Check heap and OldGen usage
+        self._check_thresholds(self._rules[:split], metrics, now, new_alerts)
         
         # Check OOM prediction
         oom_prediction = metrics.get('oom_prediction')
         if oom_prediction and oom_prediction.get('predicted'):
             time_to_oom = oom_prediction.get('time_to_oom_seconds', 0)
-            threshold = monitoring.get('oom_prediction_threshold', 3600)
             
-            if time_to_oom < threshold:
+            if time_to_oom < self.oom_threshold:
                 alert = Alert(
                     level=AlertLevel.CRITICAL,
                     title="OOM Predicted",
-                    message=f"OOM predicted in {time_to_oom/60:.1f} minutes",
+                    message=_MSG_TEMPLATES['oom_prediction'].format_map({'minutes': time_to_oom / 60}),
                     metric="oom_prediction",
                     value=time_to_oom,
-                    threshold=threshold,
-                    timestamp=time.time()
+                    threshold=self.oom_threshold,
+                    timestamp=now
                 )
                 new_alerts.append(alert)
         
         # Check stuck threads
         stuck_threads = metrics.get('stuck_threads', 0)
         if stuck_threads > 0:
-            level = AlertLevel.CRITICAL if stuck_threads >= 10 else AlertLevel.WARNING
+            level = AlertLevel.CRITICAL if stuck_threads >= _STUCK_THREAD_BOUNDS[-1] else AlertLevel.WARNING
             alert = Alert(
                 level=level,
                 title=f"Stuck Threads Detected",
-                message=f"{stuck_threads} threads are stuck or blocked",
+                message=_MSG_TEMPLATES['stuck_threads'].format_map({'count': stuck_threads}),
                 metric="stuck_threads",
                 value=stuck_threads,
                 threshold=0,
-                timestamp=time.time()
-            )
-            new_alerts.append(alert)
-        
-        # Check thread pool saturation
-        thread_pool_util = metrics.get('thread_pool', {}).get('utilization', 0)
-        if thread_pool_util >= tomcat.get('thread_pool_critical_threshold', 0.9):
-            alert = Alert(
-                level=AlertLevel.CRITICAL,
-                title="Critical Thread Pool Saturation",
-                message=f"Thread pool utilization is at {thread_pool_util*100:.1f}%",
-                metric="thread_pool_utilization",
-                value=thread_pool_util,
-                threshold=tomcat.get('thread_pool_critical_threshold'),
-                timestamp=time.time()
-            )
-            new_alerts.append(alert)
-        elif thread_pool_util >= tomcat.get('thread_pool_warn_threshold', 0.7):
-            alert = Alert(
-                level=AlertLevel.WARNING,
-                title="High Thread Pool Utilization",
-                message=f"Thread pool utilization is at {thread_pool_util*100:.1f}%",
-                metric="thread_pool_utilization",
-                value=thread_pool_util,
-                threshold=tomcat.get('thread_pool_warn_threshold'),
-                timestamp=time.time()
-            )
-            new_alerts.append(alert)
-        
-        # Check CPU
-        cpu_percent = metrics.get('os', {}).get('cpu', {}).get('cpu_percent', 0) / 100
-        if cpu_percent >= monitoring.get('cpu_critical_threshold', 0.95):
-            alert = Alert(
-                level=AlertLevel.CRITICAL,
-                title="Critical CPU Usage",
-                message=f"CPU usage is at {cpu_percent*100:.1f}%",
-                metric="cpu_usage",
-                value=cpu_percent,
-                threshold=monitoring.get('cpu_critical_threshold'),
-                timestamp=time.time()
+                timestamp=now
             )
             new_alerts.append(alert)
         
-        # Check memory
-        memory_percent = metrics.get('os', {}).get('memory', {}).get('percent', 0) / 100
-        if memory_percent >= monitoring.get('memory_critical_threshold', 0.9):
-            alert = Alert(
-                level=AlertLevel.CRITICAL,
-                title="Critical Memory Usage",
-                message=f"Memory usage is at {memory_percent*100:.1f}%",
-                metric="memory_usage",
-                value=memory_percent,
-                threshold=monitoring.get('memory_critical_threshold'),
-                timestamp=time.time()
-            )
-            new_alerts.append(alert)
+        # Check thread pool saturation, CPU and memory
+        self._check_thresholds(self._rules[split:], metrics, now, new_alerts)
         
         # Filter throttled alerts
         filtered_alerts = []
         for alert in new_alerts:
             if self._should_send_alert(alert):
                 filtered_alerts.append(alert)
-                self.alerts.append(alert)
-                self.alert_history.append(alert)
+                self._record(alert)
                 self.last_alert_times[alert.metric] = alert.timestamp
         
+        if filtered_alerts:
+            with self._alerts_lock:
+                self.alerts.extend(filtered_alerts)
+                self._alert_ts.extend(a.timestamp for a in filtered_alerts)
+                overflow = len(self.alerts) - MAX_ACTIVE_ALERTS
+                if overflow > 0:
+                    del self.alerts[:overflow]
+                    del self._alert_ts[:overflow]
+        
         return filtered_alerts
     
+    @staticmethod
+    def _check_thresholds(rules: List[tuple], metrics: Dict[str, Any], now: float, new_alerts: List[Alert]):
+        """
+        Evaluate threshold rules, appending an Alert for each one crossed.
+        
+        Args:
+            rules: Entries of self._rules to evaluate
+            metrics: Dictionary containing all metrics
+            now: Timestamp for the alerts
+            new_alerts: List collecting the alerts
+        """
+        # One value lookup per rule, Alert built only when crossed
+        for rule, parents, leaf, critical, warn in rules:
+            value = metrics
+            for key in parents:
+                value = value.get(key, _EMPTY)
+            value = value.get(leaf, 0) / rule.divisor
+            
+            if value >= critical:
+                level, title, threshold = AlertLevel.CRITICAL, rule.critical_title, critical
+            elif warn is not None and value >= warn:
+                level, title, threshold = AlertLevel.WARNING, rule.warn_title, warn
+            else:
+                continue
+            
+            new_alerts.append(Alert(
+                level=level,
+                title=title,
+                message=rule.message.format_map({'pct': value * 100}),
+                metric=rule.metric,
+                value=value,
+                threshold=threshold,
+                timestamp=now
+            ))
+    
+    def _record(self, alert: Alert):
+        """Hand an accepted alert to the sink, or keep it in the bounded history."""
+        if self.sink is None:
+            self.alert_history.append(alert)
+            return
+        try:
+            self.sink(alert)
+        except Exception as e:
+            logger.error("Alert sink failed: %s", e)
+    
     def _should_send_alert(self, alert: Alert) -> bool:
         """Check if alert should be sent based on throttling."""
         last_time = self.last_alert_times.get(alert.metric)
@@ -349,9 +463,13 @@ class AlertManager:
     def get_active_alerts(self, max_age_seconds: int = 300) -> List[Alert]:
         """Get alerts from the last N seconds."""
         cutoff = time.time() - max_age_seconds
-        return [a for a in self.alerts if a.timestamp > cutoff]
+        with self._alerts_lock:
+            return self.alerts[bisect_right(self._alert_ts, cutoff):]
     
     def clear_old_alerts(self, max_age_seconds: int = 3600):
         """Clear alerts older than max_age_seconds."""
         cutoff = time.time() - max_age_seconds
-        self.alerts = [a for a in self.alerts if a.timestamp > cutoff]
+        with self._alerts_lock:
+            index = bisect_right(self._alert_ts, cutoff)
+            del self.alerts[:index]
+            del self._alert_ts[:index]
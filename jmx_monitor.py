@@ -5,31 +5,54 @@ Uses read-only JMX access to gather thread, heap, and thread pool metrics.
 import logging
 import socket
 import json
+import random
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from collections import defaultdict
+from enum import IntEnum
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
+# How long heap, OldGen and thread dump samples are kept
+HISTORY_WINDOW_SECONDS = 3600
 
-@dataclass
+
+class ThreadState(IntEnum):
+    """JVM thread states (java.lang.Thread.State) seen in thread dumps."""
+    RUNNABLE = 0
+    WAITING = 1
+    TIMED_WAITING = 2
+    BLOCKED = 3
+
+
+# Simulated thread dump contents (shared, never mutated)
+THREAD_STATES = tuple(ThreadState)
+SIMULATED_THREAD_COUNT = 20
+SIMULATED_ALWAYS_BLOCKED = 5
+_SIMULATED_STACK_TRACE = (
+    "org.apache.tomcat.util.net.NioEndpoint$SocketProcessor.run(NioEndpoint.java:123)",
+    "java.util.concurrent.ThreadPoolExecutor.runWorker(ThreadPoolExecutor.java:456)",
+)
+
+
+@dataclass(frozen=True, slots=True)
 class ThreadInfo:
     """Thread information from thread dump."""
     thread_id: int
     name: str
-    state: str
+    state: ThreadState
     blocked_count: int
     blocked_time: int
     waited_count: int
     waited_time: int
     in_native: bool
     suspended: bool
-    stack_trace: List[str]
+    stack_trace: Tuple[str, ...]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HeapMetrics:
     """Heap memory metrics."""
     used: int
@@ -39,7 +62,7 @@ class HeapMetrics:
     timestamp: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ThreadPoolMetrics:
     """Thread pool metrics."""
     current_threads: int
@@ -57,47 +80,108 @@ class JMXMonitor:
     In production, you would use jpype1 or py4j for full JMX support.
     """
     
-    def __init__(self, host: str, port: int, timeout: int = 10):
-        """Initialize JMX monitor."""
+    def __init__(self, host: str, port: int, timeout: int = 10, history_size: int = 720):
+        """
+        Initialize JMX monitor.
+        
+        Args:
+            host: JMX host
+            port: JMX port
+            timeout: Connection timeout in seconds
+            history_size: Maximum samples kept per history (about one hour of polls)
+        """
         self.host = host
         self.port = port
         self.timeout = timeout
         self.connected = False
         
-        # Track blocked threads
-        self.thread_blocked_counts = defaultdict(int)
-        self.thread_history = []
+        # Kept open between checks so each poll doesn't cost a handshake and a TIME_WAIT socket
+        self._sock: Optional[socket.socket] = None
+        
+        # Source of simulated metric values
+        self._rng = random.Random()
+        
+        # Consecutive BLOCKED observations per thread id (only currently blocked threads)
+        self.thread_blocked_counts: Dict[int, int] = {}
+        self.thread_history = deque(maxlen=history_size)
         
-        # Track heap metrics for trend analysis
-        self.heap_history = []
-        self.oldgen_history = []
+        # Reuse the last thread dump for this long so one tick never dumps twice
+        self.dump_cache_ttl = 1.0
+        self._last_dump: Optional[List[ThreadInfo]] = None
+        self._last_dump_at = 0.0
         
-        logger.info(f"JMX Monitor initialized for {host}:{port}")
+        # Last batched attribute read, shared by the heap/OldGen/thread pool getters
+        self.batch_cache_ttl = 0.5
+        self._batch: Optional[Dict[str, Any]] = None
+        self._batch_at = 0.0
+        
+        # Track heap metrics for trend analysis (oldest first; bounded, trimmed to the last hour)
+        self.heap_history = deque(maxlen=history_size)
+        self.oldgen_history = deque(maxlen=history_size)
+        
+        logger.info("JMX Monitor initialized for %s:%s", host, port)
+    
+    def _socket_alive(self) -> bool:
+        """Check that the cached socket is still connected (no pending error, peer hasn't closed)."""
+        sock = self._sock
+        if sock is None:
+            return False
+        try:
+            if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+                return False
+            # An empty non-blocking peek means the peer closed the connection
+            sock.setblocking(False)
+            try:
+                return sock.recv(1, socket.MSG_PEEK) != b''
+            finally:
+                sock.settimeout(self.timeout)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+    
+    def close(self):
+        """Close the cached JMX socket."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self.connected = False
     
     def connect(self) -> bool:
         """
         Test JMX connection.
         
+        The socket is kept open and reused by later checks; a new one is only
+        opened when the previous connection has failed.
+        
         Note: In a real implementation, this would establish JMX connection.
         For this demo, we simulate the connection check.
         """
+        if self._socket_alive():
+            self.connected = True
+            return True
+        
         try:
             # Simulate connection check
+            self.close()
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             sock.settimeout(self.timeout)
             result = sock.connect_ex((self.host, self.port))
-            sock.close()
             
             if result == 0:
+                self._sock = sock
                 self.connected = True
-                logger.info(f"JMX connection established to {self.host}:{self.port}")
+                logger.info("JMX connection established to %s:%s", self.host, self.port)
                 return True
             else:
-                logger.warning(f"JMX port {self.port} not reachable")
+                sock.close()
+                logger.warning("JMX port %s not reachable", self.port)
                 self.connected = False
                 return False
         except Exception as e:
-            logger.error(f"Failed to connect to JMX: {e}")
+            logger.error("Failed to connect to JMX: %s", e)
             self.connected = False
             return False
     
@@ -105,6 +189,25 @@ class JMXMonitor:
         """
         Get thread dump from JVM.
         
+        A dump taken less than ``dump_cache_ttl`` seconds ago is returned
+        as-is instead of asking the JVM again.
+        
+        Returns:
+            List of threads
+        """
+        now = time.monotonic()
+        if self._last_dump is not None and now - self._last_dump_at < self.dump_cache_ttl:
+            return self._last_dump
+        
+        threads = self._take_thread_dump()
+        self._last_dump = threads
+        self._last_dump_at = now
+        return threads
+    
+    def _take_thread_dump(self) -> List[ThreadInfo]:
+        """
+        Take a fresh thread dump and record it in the history and blocked counts.
+        
         Note: In production, this would use JMX ThreadMXBean.dumpAllThreads()
         For this demo, we return simulated data.
         """
@@ -113,41 +216,50 @@ class JMXMonitor:
         
         # Simulated thread dump data
         # In production: use jmx.invoke('java.lang:type=Threading', 'dumpAllThreads', [True, True])
-        import random
+        randint = self._rng.randint
         
-        threads = []
-        thread_states = ['RUNNABLE', 'WAITING', 'TIMED_WAITING', 'BLOCKED']
+        # Random states for most threads; the last few are always blocked
+        states = self._rng.choices(THREAD_STATES, k=SIMULATED_THREAD_COUNT - SIMULATED_ALWAYS_BLOCKED)
+        states += [ThreadState.BLOCKED] * SIMULATED_ALWAYS_BLOCKED
         
-        for i in range(20):
-            # Simulate some blocked threads
-            state = random.choice(thread_states) if i < 15 else 'BLOCKED'
-            blocked_count = random.randint(0, 10) if state == 'BLOCKED' else 0
+        threads = []
+        for i, state in enumerate(states, 1):
+            blocked_count = randint(0, 10) if state == ThreadState.BLOCKED else 0
             
             thread = ThreadInfo(
-                thread_id=i + 1,
-                name=f"http-nio-8080-exec-{i + 1}",
+                thread_id=i,
+                name=f"http-nio-8080-exec-{i}",
                 state=state,
                 blocked_count=blocked_count,
                 blocked_time=blocked_count * 1000,
-                waited_count=random.randint(0, 100),
-                waited_time=random.randint(0, 10000),
+                waited_count=randint(0, 100),
+                waited_time=randint(0, 10000),
                 in_native=False,
                 suspended=False,
-                stack_trace=[
-                    f"org.apache.tomcat.util.net.NioEndpoint$SocketProcessor.run(NioEndpoint.java:123)",
-                    f"java.util.concurrent.ThreadPoolExecutor.runWorker(ThreadPoolExecutor.java:456)"
-                ]
+                stack_trace=_SIMULATED_STACK_TRACE
             )
             threads.append(thread)
         
+        now = time.time()
         self.thread_history.append({
-            'timestamp': time.time(),
+            'timestamp': now,
             'threads': threads
         })
         
         # Keep only last hour of history
-        cutoff = time.time() - 3600
-        self.thread_history = [h for h in self.thread_history if h['timestamp'] > cutoff]
+        cutoff = now - HISTORY_WINDOW_SECONDS
+        history = self.thread_history
+        while history and history[0]['timestamp'] <= cutoff:
+            history.popleft()
+        
+        # Update blocked counts once per dump. Rebuilding the map from this dump
+        # resets unblocked threads and drops ids of threads that have exited.
+        previous = self.thread_blocked_counts
+        self.thread_blocked_counts = {
+            thread.thread_id: previous.get(thread.thread_id, 0) + 1
+            for thread in threads
+            if thread.state == ThreadState.BLOCKED
+        }
         
         return threads
     
@@ -161,94 +273,148 @@ class JMXMonitor:
         Returns:
             List of stuck threads
         """
-        threads = self.get_thread_dump()
+        return self._find_stuck(self.get_thread_dump(), threshold)
+    
+    def _find_stuck(self, threads: List[ThreadInfo], threshold: int = 5) -> List[ThreadInfo]:
+        """
+        Select the threads from a dump that have been blocked for too long.
         
-        # Update blocked counts
-        for thread in threads:
-            if thread.state == 'BLOCKED':
-                self.thread_blocked_counts[thread.thread_id] += 1
-            else:
-                self.thread_blocked_counts[thread.thread_id] = 0
+        Args:
+            threads: Thread dump
+            threshold: Number of consecutive times a thread must be blocked
         
-        # Find threads exceeding threshold
-        stuck_threads = []
-        for thread in threads:
-            if self.thread_blocked_counts[thread.thread_id] >= threshold:
-                stuck_threads.append(thread)
+        Returns:
+            List of stuck threads
+        """
+        counts = self.thread_blocked_counts
+        stuck_threads = [t for t in threads if counts.get(t.thread_id, 0) >= threshold]
         
         if stuck_threads:
-            logger.warning(f"Detected {len(stuck_threads)} stuck threads")
+            logger.warning("Detected %d stuck threads", len(stuck_threads))
         
         return stuck_threads
     
-    def get_heap_metrics(self) -> HeapMetrics:
+    def _fetch_batch(self, now: float) -> Dict[str, Any]:
+        """
+        Read every scalar JMX attribute the monitor needs in one round-trip.
+        
+        Note: In production, group the reads per MBean with
+        MBeanServerConnection.getAttributes(name, [...]) instead of one
+        getAttribute call per value:
+        - java.lang:type=Memory: HeapMemoryUsage
+        - java.lang:type=MemoryPool,name=<old gen>: Usage
+        - Catalina:type=ThreadPool,name="http-nio-8080": currentThreadCount,
+          currentThreadsBusy, maxThreads
+        
+        Args:
+            now: Timestamp to record for this sample
+        
+        Returns:
+            Raw attribute values keyed by name
+        """
+        # Simulated values
+        randint = self._rng.randint
+        max_heap = 1024 * 1024 * 1024  # 1GB
+        max_oldgen = 768 * 1024 * 1024  # 768MB
+        max_threads = 200
+        current_threads = randint(50, 150)
+        
+        return {
+            'timestamp': now,
+            # Simulate heap around 50% +/- 10%
+            'heap_used': int(max_heap * 0.5) + randint(-int(max_heap * 0.1), int(max_heap * 0.1)),
+            'heap_max': max_heap,
+            'heap_committed': max_heap,
+            'oldgen_used': int(max_oldgen * 0.6) + randint(-int(max_oldgen * 0.05), int(max_oldgen * 0.05)),
+            'oldgen_max': max_oldgen,
+            'oldgen_committed': max_oldgen,
+            'pool_current_threads': current_threads,
+            'pool_current_busy': randint(20, current_threads),
+            'pool_max_threads': max_threads
+        }
+    
+    def _get_batch(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Return the batched attribute read, refreshing it when older than ``batch_cache_ttl``.
+        
+        Args:
+            now: Timestamp to record if a new batch is fetched (defaults to the current time)
+        """
+        current = time.monotonic()
+        if self._batch is None or current - self._batch_at >= self.batch_cache_ttl:
+            self._batch = self._fetch_batch(time.time() if now is None else now)
+            self._batch_at = current
+        return self._batch
+    
+    def get_heap_metrics(self, now: Optional[float] = None) -> HeapMetrics:
         """
         Get heap memory metrics.
         
         Note: In production, use JMX MemoryMXBean.getHeapMemoryUsage()
-        """
-        # Simulated heap metrics
-        # In production: use jmx.getAttribute('java.lang:type=Memory', 'HeapMemoryUsage')
-        import random
         
-        max_heap = 1024 * 1024 * 1024  # 1GB
-        # Simulate growing heap
-        base_used = int(max_heap * 0.5)
-        variance = int(max_heap * 0.1)
-        used = base_used + random.randint(-variance, variance)
+        Args:
+            now: Sample timestamp if a new batch has to be fetched (defaults to the current time)
+        """
+        batch = self._get_batch(now)
         
         metrics = HeapMetrics(
-            used=used,
-            max=max_heap,
-            committed=max_heap,
-            usage_percent=used / max_heap,
-            timestamp=time.time()
+            used=batch['heap_used'],
+            max=batch['heap_max'],
+            committed=batch['heap_committed'],
+            usage_percent=batch['heap_used'] / batch['heap_max'],
+            timestamp=batch['timestamp']
         )
         
-        self.heap_history.append(metrics)
-        
-        # Keep only last hour
-        cutoff = time.time() - 3600
-        self.heap_history = [h for h in self.heap_history if h.timestamp > cutoff]
+        # Record each sample once, even when several callers share a batch
+        history = self.heap_history
+        if not history or history[-1].timestamp != metrics.timestamp:
+            history.append(metrics)
+            
+            # Keep only last hour
+            cutoff = metrics.timestamp - HISTORY_WINDOW_SECONDS
+            while history and history[0].timestamp <= cutoff:
+                history.popleft()
         
         return metrics
     
-    def get_oldgen_metrics(self) -> Dict[str, Any]:
+    def get_oldgen_metrics(self, now: Optional[float] = None) -> Dict[str, Any]:
         """
         Get Old Generation memory pool metrics.
         
         Note: In production, use JMX MemoryPoolMXBean for 'PS Old Gen' or 'G1 Old Gen'
-        """
-        # Simulated OldGen metrics
-        import random
         
-        max_oldgen = 768 * 1024 * 1024  # 768MB
-        base_used = int(max_oldgen * 0.6)
-        variance = int(max_oldgen * 0.05)
-        used = base_used + random.randint(-variance, variance)
+        Args:
+            now: Sample timestamp if a new batch has to be fetched (defaults to the current time)
+        """
+        batch = self._get_batch(now)
         
         metrics = {
-            'used': used,
-            'max': max_oldgen,
-            'committed': max_oldgen,
-            'usage_percent': used / max_oldgen,
-            'timestamp': time.time()
+            'used': batch['oldgen_used'],
+            'max': batch['oldgen_max'],
+            'committed': batch['oldgen_committed'],
+            'usage_percent': batch['oldgen_used'] / batch['oldgen_max'],
+            'timestamp': batch['timestamp']
         }
         
-        self.oldgen_history.append(metrics)
-        
-        # Keep only last hour
-        cutoff = time.time() - 3600
-        self.oldgen_history = [h for h in self.oldgen_history if h['timestamp'] > cutoff]
+        # Record each sample once, even when several callers share a batch
+        history = self.oldgen_history
+        if not history or history[-1]['timestamp'] != metrics['timestamp']:
+            history.append(metrics)
+            
+            # Keep only last hour
+            cutoff = metrics['timestamp'] - HISTORY_WINDOW_SECONDS
+            while history and history[0]['timestamp'] <= cutoff:
+                history.popleft()
         
         return metrics
     
-    def predict_oom(self, window_seconds: int = 300) -> Optional[Dict[str, Any]]:
+    def predict_oom(self, window_seconds: int = 300, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Predict OOM based on heap growth trend.
         
         Args:
             window_seconds: Time window for trend analysis
+            now: Reference time (defaults to the current time)
         
         Returns:
             Prediction dict with time_to_oom or None if no OOM predicted
@@ -256,23 +422,40 @@ class JMXMonitor:
         if len(self.heap_history) < 2:
             return None
         
-        # Filter to window
-        cutoff = time.time() - window_seconds
-        recent_metrics = [h for h in self.heap_history if h.timestamp > cutoff]
+        if now is None:
+            now = time.time()
+        
+        # Filter to window, scanning back from the newest sample only as far as needed
+        cutoff = now - window_seconds
+        recent_metrics = []
+        for h in reversed(self.heap_history):
+            if h.timestamp <= cutoff:
+                break
+            recent_metrics.append(h)
+        recent_metrics.reverse()
         
         if len(recent_metrics) < 2:
             return None
         
-        # Calculate growth rate (bytes per second)
-        first = recent_metrics[0]
+        # Growth rate (bytes per second) as the least-squares slope over every
+        # sample in the window, so one noisy endpoint can't swing the prediction
         last = recent_metrics[-1]
-        
-        time_diff = last.timestamp - first.timestamp
-        if time_diff <= 0:
+        t0 = recent_metrics[0].timestamp
+        n = len(recent_metrics)
+        mean_t = sum(h.timestamp - t0 for h in recent_metrics) / n
+        mean_used = sum(h.used for h in recent_metrics) / n
+        
+        sxx = 0.0
+        sxy = 0.0
+        for h in recent_metrics:
+            dt = h.timestamp - t0 - mean_t
+            sxx += dt * dt
+            sxy += dt * (h.used - mean_used)
+        
+        if sxx <= 0:
             return None
         
-        usage_diff = last.used - first.used
-        growth_rate = usage_diff / time_diff
+        growth_rate = sxy / sxx
         
         # If not growing, no OOM predicted
         if growth_rate <= 0:
@@ -290,40 +473,41 @@ class JMXMonitor:
             'time_to_oom_seconds': time_to_oom,
             'growth_rate_mb_per_sec': growth_rate / (1024 * 1024),
             'current_usage_percent': last.usage_percent,
-            'timestamp': time.time()
+            'timestamp': now
         }
     
-    def get_thread_pool_metrics(self) -> ThreadPoolMetrics:
+    def get_thread_pool_metrics(self, now: Optional[float] = None) -> ThreadPoolMetrics:
         """
         Get Tomcat thread pool metrics.
         
         Note: In production, use JMX ThreadPoolMXBean
         ObjectName: Catalina:type=ThreadPool,name="http-nio-8080"
-        """
-        # Simulated thread pool metrics
-        import random
         
-        max_threads = 200
-        current_threads = random.randint(50, 150)
-        current_busy = random.randint(20, current_threads)
-        
-        metrics = ThreadPoolMetrics(
-            current_threads=current_threads,
-            current_busy=current_busy,
-            max_threads=max_threads,
-            utilization=current_busy / max_threads,
-            timestamp=time.time()
+        Args:
+            now: Sample timestamp if a new batch has to be fetched (defaults to the current time)
+        """
+        batch = self._get_batch(now)
+        
+        return ThreadPoolMetrics(
+            current_threads=batch['pool_current_threads'],
+            current_busy=batch['pool_current_busy'],
+            max_threads=batch['pool_max_threads'],
+            utilization=batch['pool_current_busy'] / batch['pool_max_threads'],
+            timestamp=batch['timestamp']
         )
-        
-        return metrics
     
     def get_all_metrics(self) -> Dict[str, Any]:
-        """Get all JMX metrics in one call."""
+        """Get all JMX metrics in one call (one thread dump and one attribute batch per call)."""
+        # One clock read shared by every sample in this call
+        now = time.time()
+        threads = self.get_thread_dump()
+        self._batch = self._fetch_batch(now)
+        self._batch_at = time.monotonic()
         return {
-            'heap': asdict(self.get_heap_metrics()),
-            'oldgen': self.get_oldgen_metrics(),
-            'thread_pool': asdict(self.get_thread_pool_metrics()),
-            'stuck_threads': len(self.get_stuck_threads()),
-            'oom_prediction': self.predict_oom(),
-            'timestamp': time.time()
+            'heap': asdict(self.get_heap_metrics(now=now)),
+            'oldgen': self.get_oldgen_metrics(now=now),
+            'thread_pool': asdict(self.get_thread_pool_metrics(now=now)),
+            'stuck_threads': len(self._find_stuck(threads)),
+            'oom_prediction': self.predict_oom(now=now),
+            'timestamp': now
         }
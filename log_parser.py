@@ -2,16 +2,56 @@
 Access log parser for slow request correlation.
 """
 import re
+import os
+import mmap
+import heapq
 import logging
+from bisect import bisect_left
+from functools import lru_cache
+from operator import itemgetter
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
-from collections import deque
+from collections import Counter, deque
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _decrement(counter: Counter, key: Any):
+    """Decrease a count by one, removing the key when it reaches zero."""
+    count = counter[key] - 1
+    if count:
+        counter[key] = count
+    else:
+        del counter[key]
+
+
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+
+def _fast_apache_ts(s: str) -> datetime:
+    """Parse 01/Jan/2024:12:00:00 from fixed offsets."""
+    # int() alone would also accept signs, spaces and underscores in the numeric slices
+    if (len(s) != 20 or s[2] != '/' or s[6] != '/' or s[11] != ':' or s[14] != ':' or s[17] != ':'
+            or not (s[0:2] + s[7:11] + s[12:14] + s[15:17] + s[18:20]).isdigit()):
+        raise ValueError(f"unexpected timestamp layout: {s!r}")
+    return datetime(int(s[7:11]), _MONTHS[s[3:6]], int(s[0:2]),
+                    int(s[12:14]), int(s[15:17]), int(s[18:20]))
+
+
+@lru_cache(maxsize=4096)
+def _parse_ts(timestamp: str) -> datetime:
+    """Parse an access log timestamp (01/Jan/2024:12:00:00), once per distinct second."""
+    try:
+        return _fast_apache_ts(timestamp)
+    except (KeyError, ValueError):
+        return datetime.strptime(timestamp, '%d/%b/%Y:%H:%M:%S')
+
+
+@dataclass(frozen=True, slots=True)
 class AccessLogEntry:
     """Parsed access log entry."""
     timestamp: datetime
@@ -22,6 +62,19 @@ class AccessLogEntry:
     response_time_ms: int
     bytes_sent: int
     user_agent: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary (same keys as dataclasses.asdict)."""
+        return {
+            'timestamp': self.timestamp,
+            'client_ip': self.client_ip,
+            'method': self.method,
+            'path': self.path,
+            'status_code': self.status_code,
+            'response_time_ms': self.response_time_ms,
+            'bytes_sent': self.bytes_sent,
+            'user_agent': self.user_agent
+        }
 
 
 class AccessLogParser:
@@ -34,18 +87,24 @@ class AccessLogParser:
     
     # Combined log format with response time
     # 127.0.0.1 - - [01/Jan/2024:12:00:00 +0000] "GET /api/users HTTP/1.1" 200 1234 5000 "Mozilla/5.0"
+    # Adjacent fields use disjoint character classes, so each boundary has only one
+    # possible position and a non-matching line fails in linear time.
     LOG_PATTERN = re.compile(
         r'(?P<ip>[\d\.]+)\s+'
         r'(?P<ident>[\S]+)\s+'
         r'(?P<user>[\S]+)\s+'
         r'\[(?P<timestamp>[^\]]+)\]\s+'
-        r'"(?P<method>\w+)\s+(?P<path>[^\s]+)\s+(?P<protocol>[^"]+)"\s+'
+        r'"(?P<method>\w+)\s+(?P<path>[^\s]+)\s+(?P<protocol>[^"\s][^"]*)"\s+'
         r'(?P<status>\d+)\s+'
         r'(?P<bytes>\d+|-)\s+'
         r'(?P<response_time>\d+|-)\s*'
         r'"?(?P<user_agent>[^"]*)"?'
     )
     
+    # Status, bytes, response time and user agent after the quoted request line.
+    # The leading literal space lets sre skip straight to candidate positions.
+    TRAILER_PATTERN = re.compile(r' (\d+) (\d+|-) (\d+|-) "([^"]*)"')
+    
     def __init__(self, log_path: str, slow_threshold_ms: int = 5000, max_entries: int = 10000):
         """
         Initialize access log parser.
@@ -63,10 +122,66 @@ class AccessLogParser:
         self.recent_entries = deque(maxlen=max_entries)
         self.slow_requests = deque(maxlen=1000)
         
-        # File position for incremental reading
-        self.file_position = 0
+        # Running aggregates over recent_entries, updated as entries enter and leave
+        self._status_counts = Counter()
+        self._path_counts = Counter()
+        self._rt_total = 0
+        self._rt_count = 0
+        self._slow_count = 0
+        # (sequence number, response time) with decreasing response times;
+        # the front is the maximum of the window
+        self._rt_max = deque()
+        self._seq = 0
+        
+        # File position for incremental reading (None until the first read)
+        self.file_position: Optional[int] = None
+        # Bytes of an incomplete last line, kept until the rest of it is written
+        self._partial = b''
+        # Handle kept open between reads and the inode it refers to
+        self._fh = None
+        self._inode: Optional[int] = None
+        
+        logger.info("Access log parser initialized for %s", log_path)
+    
+    def _split_fields(self, line: str) -> Optional[tuple]:
+        """
+        Split a well-formed log line into its fields without the full regex.
+        
+        Args:
+            line: Log line to split
+        
+        Returns:
+            (ip, timestamp, method, path, status, bytes, response_time, user_agent)
+            or None if the line does not have the expected layout
+        """
+        ts_start = line.find(' [')
+        if ts_start < 0:
+            return None
+        head = line[:ts_start].split()
+        # %h must be an IPv4 address, as in LOG_PATTERN
+        if len(head) != 3 or not head[0].replace('.', '').isdecimal():
+            return None
+        
+        ts_end = line.find('] "', ts_start)
+        if ts_end < 0 or ']' in line[ts_start + 2:ts_end]:
+            return None
+        req_end = line.find('"', ts_end + 3)
+        if req_end < 0:
+            return None
+        request = line[ts_end + 3:req_end].split(None, 2)
+        # The method is a word starting right after the quote (\w+ without the underscore;
+        # anything unusual is left to the regex)
+        if (len(request) != 3 or not request[0].isalnum()
+                or not line.startswith(request[0], ts_end + 3)):
+            return None
+        
+        trailer = self.TRAILER_PATTERN.match(line, req_end + 1)
+        if not trailer:
+            return None
         
-        logger.info(f"Access log parser initialized for {log_path}")
+        status, bytes_str, response_time_str, user_agent = trailer.groups()
+        return (head[0], line[ts_start + 2:ts_end], request[0], request[1],
+                status, bytes_str, response_time_str, user_agent)
     
     def parse_line(self, line: str) -> Optional[AccessLogEntry]:
         """
@@ -78,44 +193,45 @@ class AccessLogParser:
         Returns:
             AccessLogEntry or None if parsing fails
         """
-        match = self.LOG_PATTERN.match(line.strip())
-        if not match:
-            logger.debug(f"Failed to parse log line: {line[:100]}")
-            return None
+        # The tokenizer ignores surrounding whitespace and line endings itself,
+        # so only the rare regex fallback pays for a stripped copy
+        fields = self._split_fields(line)
+        if fields is None:
+            # Unusual layout: fall back to the full regex
+            match = self.LOG_PATTERN.match(line.strip())
+            if not match:
+                logger.debug("Failed to parse log line: %.100s", line)
+                return None
+            fields = match.group('ip', 'timestamp', 'method', 'path', 'status',
+                                 'bytes', 'response_time', 'user_agent')
         
         try:
-            groups = match.groupdict()
+            ip, timestamp_str, method, path, status, bytes_str, response_time_str, user_agent = fields
             
             # Parse timestamp
-            timestamp_str = groups['timestamp']
             # Format: 01/Jan/2024:12:00:00 +0000
-            timestamp = datetime.strptime(
-                timestamp_str.split()[0],
-                '%d/%b/%Y:%H:%M:%S'
-            )
+            timestamp = _parse_ts(timestamp_str.split()[0])
             
             # Parse response time
-            response_time_str = groups['response_time']
             response_time_ms = int(response_time_str) if response_time_str != '-' else 0
             
             # Parse bytes
-            bytes_str = groups['bytes']
             bytes_sent = int(bytes_str) if bytes_str != '-' else 0
             
             entry = AccessLogEntry(
                 timestamp=timestamp,
-                client_ip=groups['ip'],
-                method=groups['method'],
-                path=groups['path'],
-                status_code=int(groups['status']),
+                client_ip=ip,
+                method=method,
+                path=path,
+                status_code=int(status),
                 response_time_ms=response_time_ms,
                 bytes_sent=bytes_sent,
-                user_agent=groups['user_agent']
+                user_agent=user_agent
             )
             
             return entry
         except Exception as e:
-            logger.error(f"Error parsing log entry: {e}")
+            logger.error("Error parsing log entry: %s", e)
             return None
     
     def tail_log(self, num_lines: int = 1000) -> List[AccessLogEntry]:
@@ -131,27 +247,184 @@ class AccessLogParser:
         entries = []
         
         try:
-            with open(self.log_path, 'r') as f:
-                # Seek to end and read last N lines
-                lines = deque(f, maxlen=num_lines)
+            with open(self.log_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                size = stat.st_size
+                self.file_position = size
+                self._partial = b''
+                self._inode = stat.st_ino
+                if size == 0:
+                    return entries
+                
+                # Walk back from the end over N newlines so only the tail is read and decoded
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # A last line without its newline is still being written; read_new finishes it
+                    end = mm.rfind(b'\n')
+                    self._partial = mm[end + 1:]
+                    pos = end
+                    for _ in range(num_lines):
+                        if pos < 0:
+                            break
+                        pos = mm.rfind(b'\n', 0, pos)
+                    tail = mm[pos + 1:end] if end >= 0 else b''
                 
-                for line in lines:
-                    entry = self.parse_line(line)
-                    if entry:
-                        entries.append(entry)
-                        self.recent_entries.append(entry)
-                        
-                        # Track slow requests
-                        if entry.response_time_ms >= self.slow_threshold_ms:
-                            self.slow_requests.append(entry)
+                if tail:
+                    lines = tail.decode('utf-8', errors='replace').split('\n')
+                    self._ingest(lines, entries)
         
         except FileNotFoundError:
-            logger.warning(f"Access log not found: {self.log_path}")
+            logger.warning("Access log not found: %s", self.log_path)
         except Exception as e:
-            logger.error(f"Error reading access log: {e}")
+            logger.error("Error reading access log: %s", e)
         
         return entries
     
+    def _ingest(self, lines: List[str], entries: List[AccessLogEntry]):
+        """Parse lines, keep the entries in memory and collect them into ``entries``."""
+        # Bound methods and the threshold as locals for the per-line loop
+        parse = self.parse_line
+        track = self._track
+        collect = entries.append
+        slow_append = self.slow_requests.append
+        slow_threshold = self.slow_threshold_ms
+        
+        for line in lines:
+            entry = parse(line)
+            if entry:
+                collect(entry)
+                track(entry)
+                
+                # Track slow requests
+                if entry.response_time_ms >= slow_threshold:
+                    slow_append(entry)
+    
+    def _track(self, entry: AccessLogEntry):
+        """Add an entry to recent_entries and the running aggregates."""
+        window = self.recent_entries
+        if len(window) == self.max_entries:
+            # The oldest entry is about to drop out of the window
+            self._untrack(window[0], self._seq - self.max_entries)
+        window.append(entry)
+        
+        rt = entry.response_time_ms
+        if rt > 0:
+            self._rt_total += rt
+            self._rt_count += 1
+        if rt >= self.slow_threshold_ms:
+            self._slow_count += 1
+        self._status_counts[entry.status_code] += 1
+        self._path_counts[entry.path] += 1
+        
+        rt_max = self._rt_max
+        while rt_max and rt_max[-1][1] <= rt:
+            rt_max.pop()
+        rt_max.append((self._seq, rt))
+        self._seq += 1
+    
+    def _untrack(self, entry: AccessLogEntry, seq: int):
+        """Remove an entry leaving recent_entries from the running aggregates."""
+        rt = entry.response_time_ms
+        if rt > 0:
+            self._rt_total -= rt
+            self._rt_count -= 1
+        if rt >= self.slow_threshold_ms:
+            self._slow_count -= 1
+        _decrement(self._status_counts, entry.status_code)
+        _decrement(self._path_counts, entry.path)
+        
+        if self._rt_max and self._rt_max[0][0] == seq:
+            self._rt_max.popleft()
+    
+    def _ensure_open(self, entries: List[AccessLogEntry]):
+        """
+        Return the persistent handle on the access log, reopening it after rotation.
+        
+        Lines still unread in a rotated-away file are parsed into ``entries``
+        before switching.
+        
+        Args:
+            entries: List collecting newly parsed entries
+        
+        Raises:
+            FileNotFoundError: If the log does not exist
+        """
+        inode = os.stat(self.log_path).st_ino
+        if self._inode is not None and inode != self._inode:
+            logger.info("Access log rotated, reopening: %s", self.log_path)
+            if self._fh is not None:
+                self._read_delta(self._fh, entries, final=True)
+                self._fh.close()
+                self._fh = None
+            self.file_position = 0
+            self._partial = b''
+        
+        if self._fh is None:
+            self._fh = open(self.log_path, 'rb')
+            self._inode = os.fstat(self._fh.fileno()).st_ino
+        return self._fh
+    
+    def _read_delta(self, fh, entries: List[AccessLogEntry], final: bool = False):
+        """
+        Parse the bytes appended to an open log since ``file_position``.
+        
+        Args:
+            fh: Open binary handle on the log
+            entries: List collecting newly parsed entries
+            final: Treat a trailing partial line as complete (file was rotated away)
+        """
+        fd = fh.fileno()
+        size = os.fstat(fd).st_size
+        if size < self.file_position:
+            logger.info("Access log truncated, reading from start: %s", self.log_path)
+            self.file_position = 0
+            self._partial = b''
+        if size == self.file_position and not (final and self._partial):
+            return
+        
+        data = os.pread(fd, size - self.file_position, self.file_position)
+        self.file_position += len(data)
+        
+        # The last element is '' after a complete line, otherwise a partial line to finish later
+        lines = (self._partial + data).split(b'\n')
+        self._partial = b'' if final else lines.pop()
+        self._ingest([line.decode('utf-8', errors='replace') for line in lines], entries)
+    
+    def read_new(self, initial_lines: int = 100) -> List[AccessLogEntry]:
+        """
+        Read only the lines appended to the access log since the last call.
+        
+        The first call tails the last ``initial_lines`` lines instead of
+        reading the whole file. The file stays open between calls; it is
+        reopened when rotated (new inode) and re-read from the start when
+        truncated.
+        
+        Args:
+            initial_lines: Number of lines to tail on the first call
+        
+        Returns:
+            List of newly parsed log entries
+        """
+        if self.file_position is None:
+            return self.tail_log(num_lines=initial_lines)
+        
+        entries = []
+        
+        try:
+            fh = self._ensure_open(entries)
+            self._read_delta(fh, entries)
+        except FileNotFoundError:
+            logger.warning("Access log not found: %s", self.log_path)
+        except Exception as e:
+            logger.error("Error reading access log: %s", e)
+        
+        return entries
+    
+    def close(self):
+        """Close the persistent access log handle."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+    
     def get_slow_requests(self, limit: int = 100) -> List[AccessLogEntry]:
         """
         Get recent slow requests.
@@ -181,31 +454,17 @@ class AccessLogParser:
                 'top_paths': []
             }
         
-        entries = list(self.recent_entries)
-        
         # Calculate stats
-        response_times = [e.response_time_ms for e in entries if e.response_time_ms > 0]
-        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-        max_response_time = max(response_times) if response_times else 0
-        
-        # Count status codes
-        status_codes = {}
-        for entry in entries:
-            status = entry.status_code
-            status_codes[status] = status_codes.get(status, 0) + 1
-        
-        # Count paths
-        path_counts = {}
-        for entry in entries:
-            path = entry.path
-            path_counts[path] = path_counts.get(path, 0) + 1
+        avg_response_time = self._rt_total / self._rt_count if self._rt_count else 0
+        max_response_time = self._rt_max[0][1] if self._rt_max else 0
         
-        # Get top paths
-        top_paths = sorted(path_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Count status codes and paths
+        status_codes = dict(self._status_counts)
+        top_paths = heapq.nlargest(10, self._path_counts.items(), key=itemgetter(1))
         
         return {
-            'total_requests': len(entries),
-            'slow_requests': len([e for e in entries if e.response_time_ms >= self.slow_threshold_ms]),
+            'total_requests': len(self.recent_entries),
+            'slow_requests': self._slow_count,
             'avg_response_time_ms': avg_response_time,
             'max_response_time_ms': max_response_time,
             'status_codes': status_codes,
@@ -216,6 +475,9 @@ class AccessLogParser:
         """
         Correlate slow requests with stuck thread detections.
         
+        Each slow request is paired with the nearest stuck thread detection,
+        if one happened within 30 seconds of it.
+        
         Args:
             stuck_thread_timestamps: List of timestamps when stuck threads were detected
         
@@ -224,21 +486,26 @@ class AccessLogParser:
         """
         correlations = []
         
+        stuck_timestamps = sorted(stuck_thread_timestamps)
+        if not stuck_timestamps:
+            return correlations
+        
         slow_requests = self.get_slow_requests()
         
         for request in slow_requests:
             request_timestamp = request.timestamp.timestamp()
             
-            # Check if any stuck thread detection was within 30 seconds of this request
-            for stuck_timestamp in stuck_thread_timestamps:
-                time_diff = abs(request_timestamp - stuck_timestamp)
-                
-                if time_diff <= 30:  # 30 second window
-                    correlations.append({
-                        'request': asdict(request),
-                        'stuck_thread_timestamp': stuck_timestamp,
-                        'time_difference_seconds': time_diff
-                    })
-                    break
+            # Only the detections either side of the request can be the nearest
+            i = bisect_left(stuck_timestamps, request_timestamp)
+            neighbours = stuck_timestamps[max(0, i - 1):i + 1]
+            stuck_timestamp = min(neighbours, key=lambda ts: abs(request_timestamp - ts))
+            time_diff = abs(request_timestamp - stuck_timestamp)
+            
+            if time_diff <= 30:  # 30 second window
+                correlations.append({
+                    'request': request.to_dict(),
+                    'stuck_thread_timestamp': stuck_timestamp,
+                    'time_difference_seconds': time_diff
+                })
         
         return correlations
@@ -4,6 +4,8 @@ Main monitoring coordinator that orchestrates all monitoring components.
 import logging
 import time
 import threading
+import orjson
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Dict, Any, Optional
 from config_manager import Config
 from jmx_monitor import JMXMonitor
@@ -36,19 +38,19 @@ class MonitoringCoordinator:
         self.config = config
         
         # Initialize monitors
-        jmx_config = config['jmx']
         self.jmx_monitor = JMXMonitor(
-            host=jmx_config['host'],
-            port=jmx_config['port'],
-            timeout=jmx_config.get('connection_timeout', 10)
+            host=config.jmx.host,
+            port=config.jmx.port,
+            timeout=config.jmx.connection_timeout,
+            # Enough samples for an hour of history at the polling interval
+            history_size=max(2, 3600 // max(1, config.monitoring.thread_dump_interval))
         )
         
         self.os_monitor = OSMonitor()
         
-        tomcat_config = config['tomcat']
         self.log_parser = AccessLogParser(
-            log_path=tomcat_config['access_log_path'],
-            slow_threshold_ms=tomcat_config['slow_request_threshold']
+            log_path=config.tomcat.access_log_path,
+            slow_threshold_ms=config.tomcat.slow_request_threshold
         )
         
         # Initialize health and alerting
@@ -56,9 +58,16 @@ class MonitoringCoordinator:
         self.alert_manager = AlertManager(config.config)
         self.alert_dispatcher = AlertDispatcher(config.config)
         
-        # Monitoring state
+        # JMX, OS and access log collection are independent and run side by side
+        self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='collector')
+        self._collectors: Dict[str, Future] = {}
+        
+        # Monitoring state (guarded by _state_lock; read from web server threads)
+        self._state_lock = threading.RLock()
         self.current_metrics = {}
         self.current_health = {}
+        # Bumped after each monitoring cycle so consumers can tell when state changed
+        self.generation = 0
         self.running = False
         self.monitor_thread = None
         
@@ -67,18 +76,55 @@ class MonitoringCoordinator:
         
         logger.info("Monitoring coordinator initialized")
     
-    def collect_metrics(self) -> Dict[str, Any]:
+    def _collect_jmx_metrics(self) -> Dict[str, Any]:
+        """Re-check the JMX connection (cheap while it is alive) and read JVM metrics."""
+        self.jmx_monitor.connect()
+        return self.jmx_monitor.get_all_metrics()
+    
+    def _collect_request_metrics(self) -> Dict[str, Any]:
+        """Parse new access log lines and summarize recent requests."""
+        # Parse only lines written since the last cycle
+        self.log_parser.read_new()
+        return {
+            'requests': self.log_parser.get_request_stats(),
+            'slow_requests': len(self.log_parser.get_slow_requests(limit=50))
+        }
+    
+    def _submit(self, source: str, fn) -> Future:
+        """Start a collector, or keep waiting on it if the last run is still going."""
+        future = self._collectors.get(source)
+        if future is None or future.done():
+            future = self._pool.submit(fn)
+            self._collectors[source] = future
+        return future
+    
+    @staticmethod
+    def _result(future: Future, source: str) -> Any:
+        """Get a collector's result, raising if it failed or has not finished."""
+        if not future.done():
+            raise TimeoutError(f"{source} collection timed out")
+        return future.result()
+    
+    def collect_metrics(self, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Collect all metrics from all sources.
         
+        Args:
+            timeout: Seconds to wait for the collectors (None waits indefinitely)
+        
         Returns:
             Dictionary containing all metrics
         """
         metrics = {}
         
+        jmx_future = self._submit('JMX', self._collect_jmx_metrics)
+        os_future = self._submit('OS', self.os_monitor.get_all_metrics)
+        log_future = self._submit('Access log', self._collect_request_metrics)
+        wait((jmx_future, os_future, log_future), timeout=timeout)
+        
         # JMX metrics
         try:
-            jmx_metrics = self.jmx_monitor.get_all_metrics()
+            jmx_metrics = self._result(jmx_future, 'JMX')
             metrics.update(jmx_metrics)
         except Exception as e:
             logger.error(f"Failed to collect JMX metrics: {e}")
@@ -86,7 +132,7 @@ class MonitoringCoordinator:
         
         # OS metrics
         try:
-            os_metrics = self.os_monitor.get_all_metrics()
+            os_metrics = self._result(os_future, 'OS')
             metrics['os'] = os_metrics
         except Exception as e:
             logger.error(f"Failed to collect OS metrics: {e}")
@@ -94,11 +140,7 @@ class MonitoringCoordinator:
         
         # Access log metrics
         try:
-            # Tail recent logs
-            self.log_parser.tail_log(num_lines=100)
-            request_stats = self.log_parser.get_request_stats()
-            metrics['requests'] = request_stats
-            metrics['slow_requests'] = len(self.log_parser.get_slow_requests(limit=50))
+            metrics.update(self._result(log_future, 'Access log'))
         except Exception as e:
             logger.error(f"Failed to parse access logs: {e}")
             metrics['log_error'] = str(e)
@@ -168,21 +210,26 @@ class MonitoringCoordinator:
         while self.running:
             try:
                 # Collect metrics
-                metrics = self.collect_metrics()
-                self.current_metrics = metrics
+                metrics = self.collect_metrics(timeout=max(1, interval - 1))
                 
                 # Calculate health
                 health = self.calculate_health(metrics)
-                self.current_health = health
+                
+                # Publish metrics and health together so readers never see a mix of cycles
+                with self._state_lock:
+                    self.current_metrics = metrics
+                    self.current_health = health
                 
                 # Check for alerts
                 self.check_and_dispatch_alerts(metrics)
                 
                 # Clean up old alerts
                 self.alert_manager.clear_old_alerts()
+                with self._state_lock:
+                    self.generation += 1
                 
                 logger.debug(f"Monitoring cycle complete. Health: {health.get('overall_score')}")
-                
+            
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
             
@@ -229,9 +276,13 @@ class MonitoringCoordinator:
         Returns:
             Dictionary with current metrics, health, and alerts
         """
+        with self._state_lock:
+            metrics = self.current_metrics
+            health = self.current_health
+        
         return {
-            'metrics': self.current_metrics,
-            'health': self.current_health,
+            'metrics': metrics,
+            'health': health,
             'active_alerts': [
                 {
                     'level': a.level.value,
@@ -245,5 +296,16 @@ class MonitoringCoordinator:
             ],
             'monitoring_active': self.running,
             'jmx_connected': self.jmx_monitor.connected,
+            'alert_latency': self.alert_dispatcher.get_latency_stats(),
             'timestamp': time.time()
         }
+    
+    def get_current_status_json(self) -> bytes:
+        """
+        Get current monitoring status serialized as JSON.
+        
+        Returns:
+            UTF-8 JSON bytes of get_current_status()
+        """
+        # Status code counts are keyed by int
+        return orjson.dumps(self.get_current_status(), option=orjson.OPT_NON_STR_KEYS)
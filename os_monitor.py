@@ -1,13 +1,19 @@
 """
 OS metrics collection using psutil.
 """
+import os
+import time
 import psutil
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
 
+# Byte conversions as multiplications
+_INV_MB = 1.0 / (1 << 20)
+_INV_GB = 1.0 / (1 << 30)
+
 
 @dataclass
 class OSMetrics:
@@ -34,15 +40,22 @@ class OSMonitor:
             disk_path: Disk path to monitor (default: root)
         """
         self.disk_path = disk_path
+        # Linux exposes one /proc/<pid> directory per process
+        self._has_proc = os.path.isdir('/proc')
+        
+        # Prime psutil's CPU counters so later non-blocking calls return a real delta
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        
         logger.info("OS Monitor initialized")
     
     def get_cpu_metrics(self) -> Dict[str, float]:
         """Get CPU metrics."""
-        # Get CPU percent (averaged over 1 second)
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # CPU percent since the previous call (non-blocking)
+        cpu_percent = psutil.cpu_percent(interval=None)
         
-        # Get per-CPU percentages
-        per_cpu = psutil.cpu_percent(interval=0, percpu=True)
+        # Get per-CPU percentages over the same window
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
         
         # Get load average (Unix only)
         try:
@@ -65,12 +78,12 @@ class OSMonitor:
         swap = psutil.swap_memory()
         
         return {
-            'total_mb': mem.total / (1024 * 1024),
-            'available_mb': mem.available / (1024 * 1024),
-            'used_mb': mem.used / (1024 * 1024),
+            'total_mb': mem.total * _INV_MB,
+            'available_mb': mem.available * _INV_MB,
+            'used_mb': mem.used * _INV_MB,
             'percent': mem.percent,
-            'swap_total_mb': swap.total / (1024 * 1024),
-            'swap_used_mb': swap.used / (1024 * 1024),
+            'swap_total_mb': swap.total * _INV_MB,
+            'swap_used_mb': swap.used * _INV_MB,
             'swap_percent': swap.percent
         }
     
@@ -80,9 +93,9 @@ class OSMonitor:
             disk = psutil.disk_usage(self.disk_path)
             
             return {
-                'total_gb': disk.total / (1024 * 1024 * 1024),
-                'used_gb': disk.used / (1024 * 1024 * 1024),
-                'free_gb': disk.free / (1024 * 1024 * 1024),
+                'total_gb': disk.total * _INV_GB,
+                'used_gb': disk.used * _INV_GB,
+                'free_gb': disk.free * _INV_GB,
                 'percent': disk.percent
             }
         except Exception as e:
@@ -116,6 +129,10 @@ class OSMonitor:
     def get_process_count(self) -> int:
         """Get total number of running processes."""
         try:
+            if self._has_proc:
+                # Count /proc/<pid> entries without building the pid list
+                with os.scandir('/proc') as entries:
+                    return sum(1 for entry in entries if entry.name.isdigit())
             return len(psutil.pids())
         except Exception as e:
             logger.error(f"Failed to get process count: {e}")
@@ -123,8 +140,6 @@ class OSMonitor:
     
     def get_all_metrics(self) -> Dict[str, Any]:
         """Get all OS metrics."""
-        import time
-        
         return {
             'cpu': self.get_cpu_metrics(),
             'memory': self.get_memory_metrics(),
@@ -134,13 +149,26 @@ class OSMonitor:
             'timestamp': time.time()
         }
     
-    def to_os_metrics(self) -> OSMetrics:
-        """Convert to OSMetrics dataclass."""
-        import time
+    def to_os_metrics(self, metrics: Optional[Dict[str, Any]] = None) -> OSMetrics:
+        """
+        Convert to OSMetrics dataclass.
         
-        cpu = self.get_cpu_metrics()
-        memory = self.get_memory_metrics()
-        disk = self.get_disk_metrics()
+        Args:
+            metrics: Result of get_all_metrics to convert; collected afresh if omitted
+        
+        Returns:
+            OSMetrics snapshot
+        """
+        if metrics is None:
+            metrics = {
+                'cpu': self.get_cpu_metrics(),
+                'memory': self.get_memory_metrics(),
+                'disk': self.get_disk_metrics(),
+                'timestamp': time.time()
+            }
+        cpu = metrics['cpu']
+        memory = metrics['memory']
+        disk = metrics['disk']
         
         return OSMetrics(
             cpu_percent=cpu['cpu_percent'],
@@ -155,5 +183,5 @@ class OSMonitor:
                 cpu['load_average_5m'],
                 cpu['load_average_15m']
             ),
-            timestamp=time.time()
+            timestamp=metrics['timestamp']
         )
@@ -0,0 +1,129 @@
+"""
+Tests for alert delivery.
+"""
+import email
+import smtplib
+import socket
+import unittest
+from email import policy
+
+from alerter import CircuitState, EmailAlerter, _is_retryable_smtp
+from health_scorer import Alert, AlertLevel
+
+
+class RetryableSMTPTest(unittest.TestCase):
+    """Only transient SMTP failures are retried."""
+    
+    def test_transient_errors_are_retried(self):
+        for error in (
+            smtplib.SMTPServerDisconnected("connection lost"),
+            smtplib.SMTPResponseException(421, b"service not available"),
+            smtplib.SMTPSenderRefused(451, b"try later", 'a@example.com'),
+            ConnectionRefusedError(),
+            TimeoutError(),
+            socket.timeout(),
+            OSError("network unreachable"),
+        ):
+            self.assertTrue(_is_retryable_smtp(error), repr(error))
+    
+    def test_permanent_errors_are_not_retried(self):
+        for error in (
+            smtplib.SMTPResponseException(550, b"mailbox unavailable"),
+            smtplib.SMTPAuthenticationError(535, b"bad credentials"),
+            smtplib.SMTPSenderRefused(553, b"bad sender", 'a@example.com'),
+            smtplib.SMTPRecipientsRefused({'b@example.com': (550, b"no such user")}),
+            smtplib.SMTPNotSupportedError("AUTH not supported"),
+            smtplib.SMTPException("unexpected"),
+            ValueError("bad message"),
+        ):
+            self.assertFalse(_is_retryable_smtp(error), repr(error))
+
+
+class RefusingSMTP:
+    """SMTP stand-in whose server is up but refuses every recipient."""
+    
+    def __init__(self, *args, **kwargs):
+        self.sendmail_calls = 0
+        self.sock = None
+    
+    def starttls(self):
+        pass
+    
+    def rset(self):
+        return (250, b'ok')
+    
+    def sendmail(self, from_addr, to_addrs, msg):
+        self.sendmail_calls += 1
+        raise smtplib.SMTPRecipientsRefused({addr: (550, b"no such user") for addr in to_addrs})
+    
+    def quit(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+class EmailBreakerTest(unittest.TestCase):
+    """Email circuit breaker interplay with message failures and the bulkhead."""
+    
+    def test_refused_recipients_do_not_open_circuit(self):
+        alerter = EmailAlerter({
+            'enabled': True,
+            'to_addrs': ['nobody@example.com'],
+            'circuit_failure_threshold': 2,
+            'retry_base_delay': 0
+        })
+        servers = []
+        alerter.smtp_factory = lambda *args, **kwargs: servers.append(RefusingSMTP()) or servers[-1]
+        alert = Alert(AlertLevel.WARNING, 'title', 'message', 'heap_usage', 0.8, 0.7, 0.0)
+        
+        for _ in range(3):
+            self.assertEqual(alerter.send_alerts([alert] * 3), 0)
+        
+        self.assertEqual(alerter.breaker.state, CircuitState.CLOSED)
+        self.assertEqual(len(servers), 1)
+        # Each refused message is tried once, not retried
+        self.assertEqual(servers[0].sendmail_calls, 9)
+    
+
+    def test_full_bulkhead_does_not_use_up_half_open_probe(self):
+        alerter = EmailAlerter({'enabled': True, 'to_addrs': ['ops@example.com'], 'max_queue': 0})
+        sent = []
+        
+        class AcceptingSMTP(RefusingSMTP):
+            def sendmail(self, from_addr, to_addrs, msg):
+                sent.append(msg)
+        
+        alerter.smtp_factory = AcceptingSMTP
+        alerter.breaker.state = CircuitState.OPEN
+        alerter.breaker.opened_at = 0.0
+        alert = Alert(AlertLevel.WARNING, 'title', 'message', 'heap_usage', 0.8, 0.7, 0.0)
+        
+        # Channel busy: the batch is rejected before the breaker is consulted
+        self.assertTrue(alerter.bulkhead.try_acquire())
+        self.assertFalse(alerter.send_alert(alert))
+        alerter.bulkhead.release()
+        
+        # The probe is still available, succeeds and closes the circuit
+        self.assertTrue(alerter.send_alert(alert))
+        self.assertEqual(alerter.breaker.state, CircuitState.CLOSED)
+        self.assertEqual(len(sent), 1)
+
+
+class EmailRenderTest(unittest.TestCase):
+    """Rendered messages are valid CRLF wire format."""
+    
+    def test_long_non_ascii_subject_is_folded_with_crlf(self):
+        alerter = EmailAlerter({'enabled': True, 'to_addrs': ['ops@example.com']})
+        title = 'Überlastung des Heap-Speichers auf dem Knoten ' * 4
+        alert = Alert(AlertLevel.CRITICAL, title, 'message', 'heap_usage', 0.95, 0.85, 0.0)
+        
+        subject, raw = alerter._build_message(alert)
+        
+        self.assertNotIn(b'\n', raw.replace(b'\r\n', b''))
+        message = email.message_from_bytes(raw, policy=policy.SMTP)
+        self.assertEqual(' '.join(message['Subject'].split()), ' '.join(subject.split()))
+
+
+if __name__ == '__main__':
+    unittest.main()
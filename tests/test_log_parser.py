@@ -0,0 +1,130 @@
+"""
+Tests for the access log parser.
+"""
+import os
+import random
+import tempfile
+import unittest
+
+from datetime import datetime
+
+from log_parser import AccessLogParser, _parse_ts
+
+FIELDS = ('ip', 'timestamp', 'method', 'path', 'status', 'bytes', 'response_time', 'user_agent')
+
+BASE_LINE = '127.0.0.1 - - [01/Jan/2024:12:00:00 +0000] "GET /api/users HTTP/1.1" 200 1234 5000 "Mozilla/5.0"'
+
+
+class SplitFieldsTest(unittest.TestCase):
+    """_split_fields must only accept lines LOG_PATTERN accepts, with the same fields."""
+    
+    def setUp(self):
+        self.parser = AccessLogParser('/nonexistent/access.log')
+    
+    def assert_same_as_regex(self, line: str):
+        fields = self.parser._split_fields(line)
+        if fields is None:
+            return
+        match = self.parser.LOG_PATTERN.match(line.strip())
+        self.assertIsNotNone(match, f"tokenizer accepted a line the regex rejects: {line!r}")
+        self.assertEqual(fields, match.group(*FIELDS), line)
+    
+    def test_well_formed_line(self):
+        self.assertEqual(
+            self.parser._split_fields(BASE_LINE),
+            ('127.0.0.1', '01/Jan/2024:12:00:00 +0000', 'GET', '/api/users',
+             '200', '1234', '5000', 'Mozilla/5.0')
+        )
+    
+    def test_lines_where_layouts_differ(self):
+        lines = [
+            BASE_LINE.replace('"GET /api/users', '"GET  /api/users'),
+            BASE_LINE.replace('/api/users HTTP', '/api/users  HTTP'),
+            BASE_LINE.replace('/api/users', '/api\tusers'),
+            BASE_LINE.replace('"GET', '"G-T'),
+            BASE_LINE.replace('"GET', '" GET'),
+            BASE_LINE.replace('"GET', '"GET_X'),
+            BASE_LINE.replace('127.0.0.1', 'tomcat.example.com'),
+            BASE_LINE.replace('+0000]', '+0000]]'),
+            BASE_LINE.replace(' HTTP/1.1"', ' "'),
+            BASE_LINE + '\r',
+        ]
+        for line in lines:
+            self.assert_same_as_regex(line)
+        
+        entry = self.parser.parse_line(lines[0])
+        self.assertEqual(entry.path, '/api/users')
+        self.assertIsNone(self.parser.parse_line(lines[3]))
+        self.assertIsNone(self.parser.parse_line(lines[6]))
+    
+    def test_mutated_lines(self):
+        rng = random.Random(0)
+        for _ in range(20000):
+            chars = list(BASE_LINE)
+            for _ in range(rng.randint(1, 4)):
+                i = rng.randrange(len(chars))
+                op = rng.random()
+                if op < 0.4:
+                    del chars[i]
+                elif op < 0.8:
+                    chars.insert(i, rng.choice(' \t"[]-_.0a'))
+                else:
+                    chars[i] = rng.choice(' \t"[]-_.0a')
+            self.assert_same_as_regex(''.join(chars))
+
+
+class TimestampTest(unittest.TestCase):
+    """The fast timestamp parser accepts exactly what strptime accepts."""
+    
+    def test_malformed_timestamps_are_rejected(self):
+        for value in ('15/Mara2024:01:02:03', '01/Jan/2024:12:00000', '01/Jan/2024:12:+1:00',
+                      '01/Jan/2024:12: 1:00', '01/Jan/2024:12:0_:00', '+1/Jan/2024:12:00:00',
+                      '01/Jan/20_4:12:00:00', '01-Jan-2024:12:00:00', '01/Jan/2024 12:00:00'):
+            with self.assertRaises(ValueError, msg=value):
+                datetime.strptime(value, '%d/%b/%Y:%H:%M:%S')
+            with self.assertRaises(ValueError, msg=value):
+                _parse_ts(value)
+    
+    def test_matches_strptime(self):
+        for value in ('01/Jan/2024:12:00:00', '29/Feb/2024:23:59:59', '1/Jan/2024:12:00:00',
+                      '01/jan/2024:12:00:00'):
+            self.assertEqual(_parse_ts(value), datetime.strptime(value, '%d/%b/%Y:%H:%M:%S'))
+        
+        line = BASE_LINE.replace('01/Jan/2024:12:00:00', '01/Jan/2024:12:00000')
+        self.assertIsNone(AccessLogParser('/nonexistent/access.log').parse_line(line))
+
+
+class TailLogTest(unittest.TestCase):
+    """tail_log must leave an unterminated last line for read_new to finish."""
+    
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.log')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+    
+    def write(self, text: str, mode: str = 'a'):
+        with open(self.path, mode) as f:
+            f.write(text)
+    
+    def test_partial_last_line_is_completed_by_read_new(self):
+        self.write(BASE_LINE + '\n' + BASE_LINE[:-5], mode='w')
+        parser = AccessLogParser(self.path)
+        
+        entries = parser.tail_log(num_lines=10)
+        self.assertEqual([e.user_agent for e in entries], ['Mozilla/5.0'])
+        
+        self.write(BASE_LINE[-5:] + '\n')
+        entries = parser.read_new()
+        self.assertEqual([e.user_agent for e in entries], ['Mozilla/5.0'])
+    
+    def test_file_with_only_a_partial_line(self):
+        self.write(BASE_LINE[:30], mode='w')
+        parser = AccessLogParser(self.path)
+        self.assertEqual(parser.tail_log(num_lines=10), [])
+        
+        self.write(BASE_LINE[30:] + '\n')
+        self.assertEqual(len(parser.read_new()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()